@@ -0,0 +1,332 @@
+# Nodos del árbol sintáctico. Cada clase tiene un tipo entero (kind), la
+# etiqueta con la que se muestra en las vistas y los nombres de sus hijos en
+# fields. Cada nodo guarda en start y end el rango del texto que abarca.
+# Los identificadores, números y cadenas siguen siendo str y las listas de
+# sentencias, list.
+
+(PROGRAM, VAR_DECL, ASSIGN, INCREMENT, DECREMENT, IF, IF_ELSE, WHILE, DO_UNTIL,
+ CIN, COUT, BIN_OP, POW, RELATION, LOGICAL, ERROR) = range(16)
+
+class Node:
+    __slots__ = ('start', 'end')
+    kind = None
+    label = None
+    fields = ()
+
+    def children(self):
+        return [getattr(self, name) for name in self.fields]
+
+    def __eq__(self, other):
+        # Igualdad de estructura; las posiciones no cuentan. Se compara con una
+        # pila para no depender de la profundidad del árbol.
+        if type(self) is not type(other):
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if isinstance(a, Node):
+                if type(a) is not type(b):
+                    return False
+                stack.extend((getattr(a, name), getattr(b, name)) for name in a.fields)
+            elif isinstance(a, list):
+                if not isinstance(b, list) or len(a) != len(b):
+                    return False
+                stack.extend(zip(a, b))
+            elif a != b:
+                return False
+        return True
+
+    __hash__ = None
+
+    def __repr__(self):
+        return to_text(self)
+
+class Program(Node):
+    __slots__ = ('body',)
+    kind = PROGRAM
+    label = 'programa'
+    fields = ('body',)
+
+    def __init__(self, body, start=0, end=0):
+        self.body = body
+        self.start = start
+        self.end = end
+
+class VarDecl(Node):
+    __slots__ = ('type', 'names')
+    kind = VAR_DECL
+    fields = ('type', 'names')
+
+    def __init__(self, type, names, start=0, end=0):
+        self.type = type
+        self.names = names
+        self.start = start
+        self.end = end
+
+    @property
+    def label(self):
+        return self.type
+
+    def children(self):
+        return [self.names]
+
+class Assign(Node):
+    __slots__ = ('name', 'expr')
+    kind = ASSIGN
+    label = '='
+    fields = ('name', 'expr')
+
+    def __init__(self, name, expr, start=0, end=0):
+        self.name = name
+        self.expr = expr
+        self.start = start
+        self.end = end
+
+class Increment(Node):
+    __slots__ = ('name',)
+    kind = INCREMENT
+    label = 'incremento'
+    fields = ('name',)
+
+    def __init__(self, name, start=0, end=0):
+        self.name = name
+        self.start = start
+        self.end = end
+
+class Decrement(Node):
+    __slots__ = ('name',)
+    kind = DECREMENT
+    label = 'decremento'
+    fields = ('name',)
+
+    def __init__(self, name, start=0, end=0):
+        self.name = name
+        self.start = start
+        self.end = end
+
+class If(Node):
+    __slots__ = ('cond', 'body')
+    kind = IF
+    label = 'if'
+    fields = ('cond', 'body')
+
+    def __init__(self, cond, body, start=0, end=0):
+        self.cond = cond
+        self.body = body
+        self.start = start
+        self.end = end
+
+class IfElse(Node):
+    __slots__ = ('cond', 'body', 'orelse')
+    kind = IF_ELSE
+    label = 'if-else'
+    fields = ('cond', 'body', 'orelse')
+
+    def __init__(self, cond, body, orelse, start=0, end=0):
+        self.cond = cond
+        self.body = body
+        self.orelse = orelse
+        self.start = start
+        self.end = end
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+    kind = WHILE
+    label = 'while'
+    fields = ('cond', 'body')
+
+    def __init__(self, cond, body, start=0, end=0):
+        self.cond = cond
+        self.body = body
+        self.start = start
+        self.end = end
+
+class DoUntil(Node):
+    __slots__ = ('body', 'cond')
+    kind = DO_UNTIL
+    label = 'do-until'
+    fields = ('body', 'cond')
+
+    def __init__(self, body, cond, start=0, end=0):
+        self.body = body
+        self.cond = cond
+        self.start = start
+        self.end = end
+
+class Cin(Node):
+    __slots__ = ('name',)
+    kind = CIN
+    label = 'cin'
+    fields = ('name',)
+
+    def __init__(self, name, start=0, end=0):
+        self.name = name
+        self.start = start
+        self.end = end
+
+class Cout(Node):
+    __slots__ = ('value',)
+    kind = COUT
+    label = 'cout'
+    fields = ('value',)
+
+    def __init__(self, value, start=0, end=0):
+        self.value = value
+        self.start = start
+        self.end = end
+
+class BinOp(Node):
+    # + - * / %
+    __slots__ = ('op', 'left', 'right')
+    kind = BIN_OP
+    fields = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, start=0, end=0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.start = start
+        self.end = end
+
+    @property
+    def label(self):
+        return self.op
+
+    def children(self):
+        return [self.left, self.right]
+
+class Pow(Node):
+    __slots__ = ('left', 'right')
+    kind = POW
+    label = 'pot'
+    fields = ('left', 'right')
+
+    def __init__(self, left, right, start=0, end=0):
+        self.left = left
+        self.right = right
+        self.start = start
+        self.end = end
+
+class Relation(Node):
+    # > < >= <= == !=
+    __slots__ = ('op', 'left', 'right')
+    kind = RELATION
+    label = 'relacion'
+    fields = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, start=0, end=0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.start = start
+        self.end = end
+
+class Logical(Node):
+    # and, or
+    __slots__ = ('op', 'left', 'right')
+    kind = LOGICAL
+    label = 'comparador'
+    fields = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, start=0, end=0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.start = start
+        self.end = end
+
+class Error(Node):
+    # Sentencias que el parser descartó al recuperarse de un error de sintaxis
+    __slots__ = ()
+    kind = ERROR
+    label = 'error'
+
+    def __init__(self, start=0, end=0):
+        self.start = start
+        self.end = end
+
+# Tipos de las expresiones, que el parser puede compartir entre varios padres
+EXPRESSION_KINDS = frozenset((BIN_OP, POW, RELATION, LOGICAL))
+
+NODE_CLASSES = (Program, VarDecl, Assign, Increment, Decrement, If, IfElse, While, DoUntil,
+                Cin, Cout, BinOp, Pow, Relation, Logical, Error)
+
+class Visitor:
+    # Tabla de despacho indexada por kind con el método visit_<Clase> de cada
+    # nodo, o None si la subclase no procesa ese tipo de nodo
+    table = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.table = tuple(getattr(cls, 'visit_' + node.__name__, None) for node in NODE_CLASSES)
+
+    def visit(self, node):
+        method = self.table[node.kind]
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def generic_visit(self, node):
+        return None
+
+def to_text(value, limit=None, expand=None):
+    # repr() de nodos, listas y tuplas anidados, armado con una pila en vez de
+    # recursión. Con limit el texto se corta en esa cantidad de caracteres.
+    # expand recibe los demás objetos y devuelve lo que se muestra en su
+    # lugar, o None para usar su repr().
+    parts = []
+    size = 0
+    stack = [(False, value)]
+    while stack:
+        raw, value = stack.pop()
+        if raw:
+            text = value
+        elif isinstance(value, Node):
+            stack.append((True, ")"))
+            for index in range(len(value.fields) - 1, -1, -1):
+                stack.append((False, getattr(value, value.fields[index])))
+                if index:
+                    stack.append((True, ", "))
+            text = type(value).__name__ + "("
+        elif value.__class__ is list or value.__class__ is tuple:
+            if value.__class__ is list:
+                text, end = "[", "]"
+            else:
+                text, end = "(", ",)" if len(value) == 1 else ")"
+            stack.append((True, end))
+            for index in range(len(value) - 1, -1, -1):
+                stack.append((False, value[index]))
+                if index:
+                    stack.append((True, ", "))
+        else:
+            shown = None if expand is None else expand(value)
+            if shown is not None:
+                stack.append((False, shown))
+                continue
+            text = repr(value)
+        parts.append(text)
+        size += len(text)
+        if limit is not None and size > limit:
+            return "".join(parts)[:limit] + "…"
+    return "".join(parts)
+
+def shift(node, delta):
+    # Mueve delta caracteres las posiciones de un subárbol; los nodos
+    # compartidos se mueven una sola vez
+    stack = [node]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Node):
+            if node.kind in EXPRESSION_KINDS:
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+            node.start += delta
+            node.end += delta
+            for name in node.fields:
+                child = getattr(node, name)
+                if child.__class__ is not str:
+                    stack.append(child)
+        elif isinstance(node, list):
+            stack.extend(node)
@@ -0,0 +1,335 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import lexer
+from arbol import Node
+from codigo import CodeGenerator
+from pipeline import CompilationPipeline
+from sint import IncrementalParser, ParseSession
+from lexer import available_cpus, identifier_index, tokenize, tokenize_file, tokenize_parallel
+from sem import SemanticAnalyzer
+
+# Mediciones de rendimiento del compilador sobre programas generados o archivos.
+# Uso: python benchmark.py {lexer,archivo,comentarios,paralelo,reparseo,parser,arbol,semantico,profundo} [--lineas N] [--archivo ruta] [--profundidad N]
+
+def programa_sintetico(lineas):
+    cuerpo = [
+        "int a, b, c;",
+        "double d;",
+        "°* comentario",
+        "   de varias líneas *°",
+        "a = 3 + 4 * 2;",
+        "b = a - 1;",
+        "d = 2.5 * (a + b) ^ 2;",
+        "° comentario de línea",
+        "if a > b and b != 0 then cout a; else cout \"hola\"; end",
+        "while b < 10 do b++; end",
+        "do c = c + 1; until c == 3;",
+    ]
+    partes = ["main {"]
+    while len(partes) <= lineas:
+        partes.extend(cuerpo)
+    partes.append("}")
+    return "\n".join(partes) + "\n"
+
+def mejor_tiempo(funcion, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+def bench_lexer(texto, repeticiones):
+    referencia = None
+    for motor in lexer.BACKENDS:
+        lexer.set_backend(motor)
+        tokens = list(tokenize(texto))
+        if referencia is None:
+            referencia = tokens
+        elif tokens != referencia:
+            print(f"El motor '{motor}' no produce los mismos tokens que '{lexer.BACKENDS[0]}'")
+            return 1
+        tiempo = mejor_tiempo(lambda: tokenize(texto), repeticiones)
+        print(f"{motor:>8}: {len(tokens)} tokens en {tiempo * 1000:.1f} ms, {len(tokens) / tiempo:,.0f} tokens/s")
+    return 0
+
+def bench_archivo(texto, repeticiones):
+    # tokenize_file sobre un archivo temporal: mismos tokens que tokenize y
+    # memoria máxima acotada por el tamaño de bloque, no por el del archivo
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as f:
+        f.write(texto)
+        ruta = f.name
+    try:
+        if list(tokenize_file(ruta)) != list(tokenize(texto)):
+            print("tokenize_file no produce los mismos tokens que tokenize")
+            return 1
+        tiempo = mejor_tiempo(lambda: sum(1 for _ in tokenize_file(ruta)), repeticiones)
+        tracemalloc.start()
+        total = sum(1 for _ in tokenize_file(ruta))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.unlink(ruta)
+    tamano = len(texto.encode('utf-8'))
+    print(f"archivo de {tamano / 2**20:.1f} MiB: {total} tokens en {tiempo * 1000:.1f} ms, {total / tiempo:,.0f} tokens/s")
+    print(f"memoria máxima: {pico / 2**20:.1f} MiB")
+    return 0
+
+# Entradas adversarias para los comentarios. Al multiplicar el tamaño por 4 el
+# tiempo debe crecer de forma lineal; se tolera hasta el doble por ruido.
+CASOS_COMENTARIOS = {
+    'aperturas sin cerrar': lambda n: "°* x\n" * n,
+    'aperturas y un cierre': lambda n: "°* x\n" * n + "*°\n",
+    'comentarios cerrados': lambda n: "°* a *°\n" * n,
+    'comentario de megabytes': lambda n: "°* " + "x" * (n * 50) + " *°\n",
+    'comentarios de línea': lambda n: "° °* x\n" * n,
+}
+CRECIMIENTO_MAXIMO = 8
+TIEMPO_MINIMO = 0.005
+
+def bench_comentarios(lineas, repeticiones):
+    fallas = 0
+    for motor in lexer.BACKENDS:
+        lexer.set_backend(motor)
+        for nombre, generar in CASOS_COMENTARIOS.items():
+            chico, grande = generar(lineas), generar(lineas * 4)
+            t_chico = mejor_tiempo(lambda: tokenize(chico), repeticiones)
+            t_grande = mejor_tiempo(lambda: tokenize(grande), repeticiones)
+            crecimiento = t_grande / t_chico if t_chico else 0
+            lineal = t_grande < TIEMPO_MINIMO or crecimiento <= CRECIMIENTO_MAXIMO
+            if not lineal:
+                fallas += 1
+            print(f"{motor:>8} {nombre:<24} {len(grande) / 2**20:5.1f} MiB en {t_grande * 1000:7.1f} ms, x{crecimiento:.1f} {'' if lineal else 'NO LINEAL'}")
+    return 1 if fallas else 0
+
+def bench_paralelo(texto, repeticiones, procesos):
+    # Escalamiento del análisis en paralelo con 1, 2, 4, ... procesos
+    referencia = list(tokenize(texto))
+    base = mejor_tiempo(lambda: tokenize(texto), repeticiones)
+    print(f"secuencial: {len(referencia)} tokens en {base * 1000:.1f} ms")
+    cantidades = [1]
+    while cantidades[-1] * 2 <= procesos:
+        cantidades.append(cantidades[-1] * 2)
+    if cantidades[-1] != procesos:
+        cantidades.append(procesos)
+    for cantidad in cantidades:
+        if list(tokenize_parallel(texto, workers=cantidad)) != referencia:
+            print(f"Con {cantidad} procesos los tokens no coinciden con tokenize")
+            return 1
+        tiempo = mejor_tiempo(lambda: tokenize_parallel(texto, workers=cantidad), repeticiones)
+        print(f"{cantidad:>3} procesos: {tiempo * 1000:.1f} ms, x{base / tiempo:.2f}")
+    return 0
+
+def programa_valido(lineas):
+    # Programa sin comentarios
+    cuerpo = [
+        "int a, b, c;",
+        "double d;",
+        "a = 3 + 4 * 2;",
+        "b = a - 1;",
+        "d = 2.5 * (a + b) ^ 2;",
+        "if a > b and b != 0 then cout a; else cout \"hola\"; end",
+        "while b < 10 do b++; end",
+        "do c = c + 1; until c == 3;",
+    ]
+    partes = ["main {"]
+    while len(partes) <= lineas:
+        partes.extend(cuerpo)
+    partes.append("}")
+    return "\n".join(partes) + "\n"
+
+def bench_reparseo(lineas, repeticiones):
+    # Análisis completo contra reanálisis incremental después de cambiar un
+    # carácter en medio del programa, con el tamaño multiplicado por 4
+    for n in (lineas, lineas * 4):
+        texto = programa_valido(n)
+        medio = texto.index("a = 3", len(texto) // 2)
+        editado = texto[:medio + 4] + "5" + texto[medio + 5:]
+        tokens, tokens_editados = tokenize(texto), tokenize(editado)
+        completo = mejor_tiempo(lambda: ParseSession().parse(tokens_editados), repeticiones)
+
+        def reparsear():
+            parser = IncrementalParser()
+            parser.parse(tokens)
+            inicio = time.perf_counter()
+            parser.parse(tokens_editados)
+            return time.perf_counter() - inicio, parser
+
+        incremental, parser = min((reparsear() for _ in range(repeticiones)), key=lambda r: r[0])
+        if parser.tree != ParseSession().parse(tokens_editados):
+            print("El árbol incremental no coincide con el completo")
+            return 1
+        print(f"{n:>8} líneas: completo {completo * 1000:.1f} ms, incremental {incremental * 1000:.1f} ms ({parser.reparsed} sentencias reanalizadas)")
+    return 0
+
+def programa_anidado(lineas):
+    # Todas las sentencias dentro del cuerpo de un solo while
+    cuerpo = programa_valido(lineas).split("\n", 1)[1].rsplit("}", 1)[0]
+    return "main {\nint a, b, c;\ndouble d;\nwhile a < 1 do\n" + cuerpo.replace("int a, b, c;\n", "").replace("double d;\n", "") + "end\n}\n"
+
+def bench_parser(repeticiones):
+    # Con 10 veces más sentencias el tiempo debe crecer unas 10 veces
+    fallas = 0
+    for nombre, generar in (('primer nivel', programa_valido), ('cuerpo de while', programa_anidado)):
+        tiempos = []
+        for n in (10000, 100000):
+            tokens = tokenize(generar(n))
+            tiempo = mejor_tiempo(lambda: ParseSession().parse(tokens), repeticiones)
+            tiempos.append(tiempo)
+            print(f"{nombre:<16} {n:>7} sentencias: {tiempo * 1000:8.1f} ms, {n / tiempo:,.0f} sentencias/s")
+        crecimiento = tiempos[1] / tiempos[0]
+        if crecimiento > 10 * 2:
+            fallas += 1
+        print(f"{nombre:<16} crecimiento x{crecimiento:.1f} {'' if crecimiento <= 10 * 2 else 'NO LINEAL'}")
+    return 1 if fallas else 0
+
+def contar_nodos(arbol):
+    # Nodos distintos: los compartidos se cuentan una vez
+    vistos = set()
+    pila = [arbol]
+    while pila:
+        nodo = pila.pop()
+        if isinstance(nodo, Node):
+            if id(nodo) not in vistos:
+                vistos.add(id(nodo))
+                pila.extend(nodo.children())
+        elif isinstance(nodo, list):
+            pila.extend(nodo)
+    return len(vistos)
+
+def bench_arbol(lineas, repeticiones):
+    # Memoria del árbol sintáctico (con sus posiciones) y tiempo de recorrerlo
+    # para generar el código P, sin y con expresiones compartidas
+    tokens = tokenize(programa_valido(lineas))
+    referencia = None
+    for compartir in (False, True):
+        tracemalloc.start()
+        arbol = ParseSession(share=compartir).parse(tokens)
+        memoria, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        codigo = CodeGenerator().generate_code(arbol, compartir)
+        if referencia is None:
+            referencia = codigo
+        elif codigo != referencia:
+            print("Con expresiones compartidas el código P no coincide")
+            return 1
+        nodos = contar_nodos(arbol)
+        tiempo = mejor_tiempo(lambda: CodeGenerator().generate_code(arbol, compartir), repeticiones)
+        nombre = 'compartido' if compartir else 'árbol'
+        print(f"{nombre:>10}: {nodos} nodos, {memoria / 2**20:.1f} MiB, código P en {tiempo * 1000:.1f} ms")
+    return 0
+
+def bench_semantico(lineas, repeticiones):
+    # Análisis semántico de un programa nuevo contra el de la versión siguiente,
+    # con un carácter cambiado, que reusa las expresiones ya compiladas
+    texto = programa_valido(lineas).replace("while b < 10", "while b + 1 < 10 * a")
+    medio = texto.index("a = 3", len(texto) // 2)
+    editado = texto[:medio + 4] + "5" + texto[medio + 5:]
+
+    def analizar(versiones):
+        pipeline = CompilationPipeline()
+        for version in versiones:
+            pipeline.update(version)
+            pipeline.parse()
+            gc.collect()
+            inicio = time.perf_counter()
+            pipeline.analyze()
+            transcurrido = time.perf_counter() - inicio
+        return transcurrido, pipeline
+
+    completo, _ = min((analizar([editado]) for _ in range(repeticiones)), key=lambda r: r[0])
+    reanalisis, pipeline = min((analizar([texto, editado]) for _ in range(repeticiones)), key=lambda r: r[0])
+    nuevo = CompilationPipeline()
+    nuevo.update(editado)
+    if pipeline.analyze() != nuevo.analyze() or pipeline.semantic_errors != nuevo.semantic_errors:
+        print("El reanálisis no coincide con el análisis completo")
+        return 1
+    print(f"{lineas} líneas: análisis {completo * 1000:.1f} ms, reanálisis {reanalisis * 1000:.1f} ms ({len(pipeline.compiled)} expresiones compiladas)")
+    return 0
+
+def programa_profundo(profundidad, anidado):
+    # Expresiones con profundidad operadores encadenados a la izquierda
+    # (1 + 1 + ...) o, con anidado, entre paréntesis (1 + (1 + (...)))
+    if anidado:
+        expresion = "(1 + " * profundidad + "1" + ")" * profundidad
+    else:
+        expresion = " + ".join(["1"] * (profundidad + 1))
+    return f"main {{\nint a;\na = {expresion};\nwhile a < {expresion} do a++; end\ncout {expresion};\n}}\n"
+
+def bench_profundo(profundidad, repeticiones):
+    # El parser, el análisis semántico y el generador de código recorren el
+    # árbol con pilas explícitas: no debe haber RecursionError y con
+    # expresiones 10 veces más profundas el tiempo debe crecer unas 10 veces
+    fallas = 0
+    for nombre, anidado in (('a la izquierda', False), ('entre paréntesis', True)):
+        tiempos = []
+        for n in (profundidad // 10, profundidad):
+            tokens = tokenize(programa_profundo(n, anidado))
+            arbol = ParseSession().parse(tokens)
+            indice = identifier_index(tokens)
+
+            def analizar():
+                analizador = SemanticAnalyzer()
+                analizador.load_identifier_index(indice)
+                analizador.analyze(arbol)
+                return analizador
+
+            if analizar().errors or not CodeGenerator().generate_code(arbol):
+                print(f"El programa de profundidad {n} no se compiló bien")
+                return 1
+            parser = mejor_tiempo(lambda: ParseSession().parse(tokens), repeticiones)
+            semantico = mejor_tiempo(analizar, repeticiones)
+            codigo = mejor_tiempo(lambda: CodeGenerator().generate_code(arbol), repeticiones)
+            tiempos.append(parser + semantico + codigo)
+            print(f"{nombre:<16} {n:>7} niveles: parser {parser * 1000:.1f} ms, semántico {semantico * 1000:.1f} ms, código P {codigo * 1000:.1f} ms")
+        crecimiento = tiempos[1] / tiempos[0]
+        if crecimiento > 10 * 2:
+            fallas += 1
+        print(f"{nombre:<16} crecimiento x{crecimiento:.1f} {'' if crecimiento <= 10 * 2 else 'NO LINEAL'}")
+    return 1 if fallas else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento del compilador")
+    parser.add_argument('prueba', choices=['lexer', 'archivo', 'comentarios', 'paralelo', 'reparseo', 'parser', 'arbol', 'semantico', 'profundo'])
+    parser.add_argument('--lineas', type=int, default=20000)
+    parser.add_argument('--archivo')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--profundidad', type=int, default=100000)
+    parser.add_argument('--procesos', type=int, default=available_cpus())
+    args = parser.parse_args(argv)
+
+    if args.archivo:
+        with open(args.archivo, encoding='utf-8') as f:
+            texto = f.read()
+    else:
+        texto = programa_sintetico(args.lineas)
+
+    if args.prueba == 'lexer':
+        return bench_lexer(texto, args.repeticiones)
+    if args.prueba == 'archivo':
+        return bench_archivo(texto, args.repeticiones)
+    if args.prueba == 'comentarios':
+        return bench_comentarios(args.lineas, args.repeticiones)
+    if args.prueba == 'paralelo':
+        return bench_paralelo(texto, args.repeticiones, args.procesos)
+    if args.prueba == 'reparseo':
+        return bench_reparseo(args.lineas, args.repeticiones)
+    if args.prueba == 'parser':
+        return bench_parser(args.repeticiones)
+    if args.prueba == 'arbol':
+        return bench_arbol(args.lineas, args.repeticiones)
+    if args.prueba == 'semantico':
+        return bench_semantico(args.lineas, args.repeticiones)
+    if args.prueba == 'profundo':
+        return bench_profundo(args.profundidad, args.repeticiones)
+
+if __name__ == '__main__':
+    sys.exit(main())
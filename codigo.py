@@ -0,0 +1,319 @@
+from arbol import Node, Visitor, EXPRESSION_KINDS, BIN_OP, RELATION
+
+# Fin de un generador o de una lista en la pila de traverse_tree
+_DONE = object()
+
+# + - * / %
+ARITHMETIC_CODES = {'+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV', '%': 'MOD'}
+
+# Relación como '>', '<', '==', etc.
+RELATION_CODES = {
+    '>': 'GT',
+    '<': 'LT',
+    '>=': 'GE',
+    '<=': 'LE',
+    '==': 'EQ',
+    '!=': 'NE'
+}
+
+class CodeGenerator(Visitor):
+    def __init__(self):
+        self.code_p = []
+        self.label_counter = 0
+        self.emitted = None
+
+    def generate_code(self, syntax_tree, shared=False):
+        self.code_p = []
+        self.label_counter = 0
+        # Con un árbol de expresiones compartidas (ParseSession(share=True)) se
+        # guarda el rango de code_p que generó cada expresión, y las demás
+        # apariciones del nodo copian ese código en vez de recorrerlo
+        self.emitted = {} if shared else None
+        self.traverse_tree(syntax_tree)
+        self.emitted = None
+        return self.code_p
+
+    def new_label(self):
+        label = f"LABEL_{self.label_counter}"
+        self.label_counter += 1
+        return label
+
+    def traverse_tree(self, node):
+        # Recorrido con una pila explícita en vez de recursión. Los métodos
+        # visit_ son generadores que entregan con yield, en orden, los
+        # subárboles que hay que recorrer en ese punto del código.
+        stack = []
+        while True:
+            if not node:
+                pass
+            elif isinstance(node, Node):
+                if self.emitted is not None and node.kind in EXPRESSION_KINDS:
+                    stack.append(self.visit_shared(node))
+                elif node.kind == BIN_OP or node.kind == RELATION:
+                    self.emit_expression(node)
+                else:
+                    walk = self.visit(node)
+                    if walk is not None:
+                        stack.append(walk)
+            elif isinstance(node, list):
+                stack.append(iter(node))
+            elif isinstance(node, str):
+                self.emit_operand(node)
+
+            while stack:
+                node = next(stack[-1], _DONE)
+                if node is not _DONE:
+                    break
+                stack.pop()
+            else:
+                return
+
+    def emit_operand(self, operand):
+        if operand.isdigit() or operand.replace('.', '', 1).isdigit():
+            self.code_p.append(f"PUSH {operand}")
+        else:
+            self.code_p.append(f"LOAD {operand}")
+
+    def emit_expression(self, node):
+        # Lo mismo que visit_BinOp y visit_Relation para toda la expresión, en
+        # postorden con una pila de nodos y de instrucciones pendientes (tuplas
+        # de un elemento), sin generadores. pot y comparador no generan código.
+        code_p = self.code_p
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is tuple:
+                code_p.append(node[0])
+            elif isinstance(node, Node):
+                if node.kind == BIN_OP:
+                    stack.append((ARITHMETIC_CODES[node.op],))
+                elif node.kind == RELATION:
+                    stack.append((RELATION_CODES[node.op],))
+                else:
+                    continue
+                stack.append(node.right)
+                stack.append(node.left)
+            elif not node:
+                continue
+            elif node.isdigit() or node.replace('.', '', 1).isdigit():
+                code_p.append(f"PUSH {node}")
+            else:
+                code_p.append(f"LOAD {node}")
+
+    def visit_shared(self, node):
+        # La primera aparición de una expresión compartida guarda el rango de
+        # code_p que generó; las demás lo copian
+        span = self.emitted.get(id(node))
+        if span is not None:
+            self.code_p.extend(self.code_p[span[0]:span[1]])
+            return
+        start = len(self.code_p)
+        walk = self.visit(node)
+        if walk is not None:
+            yield from walk
+        self.emitted[id(node)] = (start, len(self.code_p))
+
+    def visit_Program(self, node):
+        yield node.body
+
+    def visit_Assign(self, node):
+        yield node.expr
+        self.code_p.append(f"STORE {node.name}")
+
+    def visit_BinOp(self, node):
+        yield node.left
+        yield node.right
+        self.code_p.append(ARITHMETIC_CODES[node.op])
+
+    def visit_IfElse(self, node):
+        yield node.cond  # Condición
+        label_else = self.new_label()
+        self.code_p.append(f"JMPZ {label_else}")
+        yield node.body  # Rama if
+        label_end = self.new_label()
+        self.code_p.append(f"JMP {label_end}")
+        self.code_p.append(f"{label_else}:")
+        yield node.orelse  # Rama else
+        self.code_p.append(f"{label_end}:")
+
+    def visit_While(self, node):
+        label_start = self.new_label()
+        self.code_p.append(f"{label_start}:")
+        yield node.cond  # Condición
+        label_end = self.new_label()
+        self.code_p.append(f"JMPZ {label_end}")
+        yield node.body  # Cuerpo
+        self.code_p.append(f"JMP {label_start}")
+        self.code_p.append(f"{label_end}:")
+
+    def visit_DoUntil(self, node):
+        label_start = self.new_label()
+        self.code_p.append(f"{label_start}:")
+        yield node.body  # Cuerpo
+        yield node.cond  # Condición
+        self.code_p.append(f"JMPZ {label_start}")
+
+    def visit_Cout(self, node):
+        if isinstance(node.value, str) and node.value.startswith('"') and node.value.endswith('"'):
+            # Es un literal de texto
+            self.code_p.append(f'PUSH {node.value}')
+        else:
+            # Es una variable o expresión
+            yield node.value
+        self.code_p.append("PRINT")
+
+    def visit_Cin(self, node):
+        self.code_p.append(f"CIN {node.name}")
+
+    def visit_Relation(self, node):
+        yield node.left  # Lado izquierdo
+        yield node.right  # Lado derecho
+        self.code_p.append(RELATION_CODES[node.op])
+
+    def visit_Increment(self, node):
+        self.code_p.append(f"LOAD {node.name}")
+        self.code_p.append("PUSH 1")
+        self.code_p.append("ADD")
+        self.code_p.append(f"STORE {node.name}")
+
+    def visit_Decrement(self, node):
+        self.code_p.append(f"LOAD {node.name}")
+        self.code_p.append("PUSH 1")
+        self.code_p.append("SUB")
+        self.code_p.append(f"STORE {node.name}")
+
+class StackMachine:
+    def __init__(self):
+        self.stack = []
+        self.variables = {}
+        self.output = []
+        self.errors = []
+        # Un threading.Event; si se activa, la ejecución se detiene en la
+        # siguiente instrucción
+        self.cancelled = None
+
+    def execute(self, code_p):
+        pc = 0
+        labels = {line.split(':', 1)[0]: idx for idx, line in enumerate(code_p) if line.strip().endswith(':')}
+        while pc < len(code_p):
+            if self.cancelled is not None and self.cancelled.is_set():
+                self.errors.append("Ejecución cancelada.")
+                break
+            try:
+                instruction = code_p[pc]
+                parts = instruction.split()
+                command = parts[0]
+
+                print(f"Instrucción: {instruction}")
+                print(f"Pila antes: {self.stack}")
+                print(f"Variables: {self.variables}")
+
+                if command == "PUSH":
+                    value = " ".join(parts[1:])
+                    if value.startswith('"') and value.endswith('"'):
+                        # Es una cadena de texto
+                        self.stack.append(value.strip('"'))
+                    elif value in self.variables:
+                        # Es una variable
+                        self.stack.append(self.variables[value])
+                    else:
+                        # Es un número
+                        self.stack.append(float(value) if '.' in value else int(value))
+
+
+                elif command == "LOAD":
+                    var_name = parts[1]
+                    if var_name not in self.variables:
+                        raise KeyError(f"Variable no inicializada: {var_name}")
+                    self.stack.append(self.variables[var_name])
+
+                elif command == "STORE":
+                    var_name = parts[1]
+                    if not self.stack:
+                        raise IndexError("Pila vacía durante operación STORE.")
+                    self.variables[var_name] = self.stack.pop()
+
+                elif command == "PRINT":
+                    if not self.stack:
+                        raise IndexError("Pila vacía durante operación PRINT.")
+                    value = self.stack.pop()
+                    if isinstance(value, (int, float)):
+                        self.output.append(str(value))
+                    else:
+                        self.output.append(value)
+
+                elif command == "CIN":
+                    print(f"Solicitando entrada para la variable '{parts[1]}'")
+                    var_name = parts[1]
+                    if hasattr(self, "input_callback"):
+                        input_value = self.input_callback(var_name)
+                        try:
+                            self.variables[var_name] = float(input_value) if '.' in input_value else int(input_value)
+                            print(f"Entrada recibida: {input_value}")
+                        except ValueError:
+                            raise ValueError(f"Entrada inválida para la variable '{var_name}': {input_value}")
+                    else:
+                        raise ValueError("No se configuró ningún callback para manejar la entrada.")
+
+                elif command in ("ADD", "SUB", "MUL", "DIV", "MOD"):
+                    if len(self.stack) < 2:
+                        raise IndexError(f"Pila insuficiente para operación {command}.")
+                    b = self.stack.pop()
+                    a = self.stack.pop()
+                    result = {
+                        "ADD": a + b,
+                        "SUB": a - b,
+                        "MUL": a * b,
+                        "DIV": a / b if b != 0 else 0,
+                        "MOD": a % b,
+                    }[command]
+                    self.stack.append(result)
+
+                elif command in ("GT", "LT", "GE", "LE", "EQ", "NE"):
+                    if len(self.stack) < 2:
+                        raise IndexError(f"Pila insuficiente para operación {command}.")
+                    b = self.stack.pop()
+                    a = self.stack.pop()
+                    result = {
+                        "GT": a > b,
+                        "LT": a < b,
+                        "GE": a >= b,
+                        "LE": a <= b,
+                        "EQ": a == b,
+                        "NE": a != b
+                    }[command]
+                    self.stack.append(1 if result else 0)
+
+                elif command == "JMP":
+                    if parts[1] not in labels:
+                        raise ValueError(f"Etiqueta no encontrada: {parts[1]}")
+                    pc = labels[parts[1]]
+                    continue
+
+                elif command == "JMPZ":
+                    if not self.stack:
+                        raise IndexError("Pila vacía durante operación JMPZ.")
+                    if not self.stack.pop():
+                        if parts[1] not in labels:
+                            raise ValueError(f"Etiqueta no encontrada: {parts[1]}")
+                        pc = labels[parts[1]]
+                        continue
+
+                elif instruction.endswith(":"):
+                    pass  # Etiquetas
+
+                else:
+                    raise ValueError(f"Instrucción desconocida: {command}")
+
+                print(f"Pila después: {self.stack}")
+                print(f"Salida: {self.output}")
+
+                pc += 1
+
+            except Exception as e:
+                error_message = f"Error en ejecución: {e}"
+                print(error_message)
+                self.errors.append(error_message)  # Agregar error a la lista
+                break
+
+        return self.output
@@ -1,8 +1,8 @@
 from PyQt6.QtCore import Qt, QStandardPaths
-from PyQt6.QtGui import QTextOption, QIcon, QTextCharFormat, QColor, QTextCursor, QPalette
+from PyQt6.QtGui import QTextOption, QIcon, QTextCharFormat, QColor, QPalette, QSyntaxHighlighter
 from PyQt6.QtWidgets import QMainWindow, QApplication, QFileDialog, QTextEdit, QHBoxLayout, QVBoxLayout, QSizePolicy, QLabel, QGridLayout
 from PyQt6 import uic
-from lexer import lexer, errores
+from lexer import tokenize, errores, LineLexer, LINE_CODE
 import sys
 import io
 import os
@@ -14,6 +14,26 @@ class NoScrollTextEdit(QTextEdit):
         # Bloquea el evento de la rueda del mouse
         pass
 
+class Highlighter(QSyntaxHighlighter):
+    def __init__(self, document, colors):
+        super(Highlighter, self).__init__(document)
+        # Lexer de una línea y un formato por tipo de token
+        self.lexer = LineLexer()
+        self.formats = {}
+        for kind, color in colors.items():
+            format = QTextCharFormat()
+            format.setForeground(color)
+            self.formats[kind] = format
+
+    def highlightBlock(self, text):
+        # El estado del bloque anterior dice si la línea empieza dentro de un comentario o una cadena
+        spans, state = self.lexer.tokens(text, max(self.previousBlockState(), LINE_CODE))
+        for start, length, kind in spans:
+            format = self.formats.get(kind)
+            if format is not None:
+                self.setFormat(start, length, format)
+        self.setCurrentBlockState(state)
+
 class LexicalAnalyzer:
     def __init__(self):
         # Colores para resaltar los tokens
@@ -31,37 +51,29 @@ class LexicalAnalyzer:
 
     def analyze(self, textEdit, outputTextEdit):
         text = textEdit.toPlainText()
-        cursor = textEdit.textCursor()
 
         # Guardar la posición actual de la barra de desplazamiento
         scroll_bar_value = outputTextEdit.verticalScrollBar().value()
 
-        # Reiniciar el lexer
-        lexer.input(text)
+        # Analizar todo el texto
+        tokens = tokenize(text)
+        line_index = tokens.line_index()
 
          # Construir la tabla HTML
         html_table = "<table style='border-collapse: collapse;' width='100%'><tr style='color: #1155d4; font-size: 15px'><th style='padding: 8px;'>Tipo</th><th style='padding: 8px;'>Valor</th><th style='padding: 8px;'>Línea</th><th style='padding: 8px;'>Columna</th></tr>"
 
-        # Obtener el siguiente token
-        while True:
-            tok = lexer.token()
-            if not tok:
-                break  # No hay más tokens
+        # Recorrer los tokens del buffer
+        for i in range(len(tokens)):
+            tok_type = tokens.type(i)
+            start = tokens.offsets[i]
 
-            # Obtener la posición del cursor para calcular la columna del token
-            cursor.setPosition(tok.lexpos)
-            line_number = cursor.blockNumber() + 1
+            # Línea y columna del token a partir del índice de inicios de línea
+            line_number, column = line_index.position(start)
                 
-            if(tok.type != 'COMENTARIO' and tok.type != 'COMENTARIO_MULTILINEA'):
+            if(tok_type != 'COMENTARIO' and tok_type != 'COMENTARIO_MULTILINEA'):
                 # Construir una fila de la tabla para el token actual
-                html_row = f"<tr><td style='text-align: center; padding: 5px; font-weight: bold;'>{tok.type}</td><td style='text-align: center; padding: 5px; font-weight: bold; color: #c4213f;'>{tok.value}</td><td style='text-align: center; padding: 5px;'>{line_number}</td><td style='text-align: center; padding: 5px;'>{self.find_column(text, tok)}</td></tr>"
+                html_row = f"<tr><td style='text-align: center; padding: 5px; font-weight: bold;'>{tok_type}</td><td style='text-align: center; padding: 5px; font-weight: bold; color: #c4213f;'>{tokens.value(i)}</td><td style='text-align: center; padding: 5px;'>{line_number}</td><td style='text-align: center; padding: 5px;'>{column}</td></tr>"
                 html_table += html_row
-            
-            start = tok.lexpos
-            end = start + len(tok.value)
-            # Aplicar formato solo si el tipo de token tiene un color definido
-            if tok.type in self.colors:
-                self.apply_format(cursor, start, end, self.colors[tok.type])
 
          # Cerrar la tabla
         html_table += "</table>"
@@ -83,17 +95,6 @@ class LexicalAnalyzer:
         outputTextEdit.adjustSize()
         outputTextEdit.setMinimumSize(711, 450)
 
-    def apply_format(self, cursor, start, end, color):
-        format = QTextCharFormat()
-        format.setForeground(color)
-        cursor.setPosition(start)
-        cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, end - start)
-        cursor.setCharFormat(format)
-
-    def find_column(self, text, token):
-        line_start = text.rfind('\n', 0, token.lexpos) + 1
-        return (token.lexpos - line_start) + 1
-
 class Main(QMainWindow):
     def __init__(self):
         super(Main, self).__init__()
@@ -659,6 +660,8 @@ class Main(QMainWindow):
 
         # Instanciar el analizador léxico
         self.lexical_analyzer = LexicalAnalyzer()
+        # El resaltado se hace por bloques con los colores del analizador léxico
+        self.highlighter = Highlighter(self.textEdit.document(), self.lexical_analyzer.colors)
 
         # Conectar el evento de cambio de texto al analizador léxico
         self.textEdit.textChanged.connect(self.analyze_text)
@@ -677,12 +680,6 @@ class Main(QMainWindow):
         # Desconectar temporalmente el evento textChanged
         self.textEdit.textChanged.disconnect(self.analyze_text)
 
-        # Limpiar el formato existente antes de aplicar uno nuevo
-        cursor = self.textEdit.textCursor()
-        cursor.select(QTextCursor.SelectionType.Document)
-        cursor.setCharFormat(QTextCharFormat())  # Borrar formato existente
-        cursor.clearSelection()
-
         # Llamar al analizador léxico solo si el texto ha cambiado
         if self.textEdit.toPlainText() != self.last_text:
             self.last_text = self.textEdit.toPlainText()
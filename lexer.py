@@ -1,5 +1,12 @@
 import ply.lex as lex
-from sem import SemanticAnalyzer
+import mmap
+import os
+import re
+import sys
+import tablas
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 
 reserved = {
     'if': 'IF',
@@ -91,19 +98,36 @@ t_NOTEQUALS = r'!='
 t_AND = r'and'
 t_OR = r'or'
 t_SEMICOLON = r';'
-t_STRING = r'\"[^\"]*\"'
+
+UNTERMINATED_COMMENT = "Unterminated comment"
 
 def t_COMENTARIO(t):
-    r'(\°\*(.|\n)*?\*\°)|(\°.*)'
-    pass
+    r'\°.*'
+    # El cierre de un comentario de bloque se busca con find desde la apertura.
+    # Si no existe, el resto del texto es un solo token de error: se reporta
+    # una vez y nada se vuelve a recorrer.
+    if t.value.startswith('°*'):
+        data = t.lexer.lexdata
+        close = data.find('*°', t.lexpos + 2)
+        if close < 0:
+            t.type = 'error'
+            t.value = UNTERMINATED_COMMENT + " in line %d column %d" % (t.lexer.lineno, t.lexpos + 1)
+            t.lexer.lineno += data.count('\n', t.lexpos)
+            t.lexer.lexpos = len(data)
+            return t
+        t.value = data[t.lexpos:close + 2]
+        t.lexer.lexpos = close + 2
+        t.lexer.lineno += t.value.count('\n')
+    return t
+
+def t_STRING(t):
+    r'\"[^\"]*\"'
+    t.lexer.lineno += t.value.count('\n')
     return t
 
 def t_IDENTIFICADOR(t):
     r'[a-zA-Z_][a-zA-Z_0-9]*'
     t.type = reserved.get(t.value,'IDENTIFICADOR')
-    if t.type == 'IDENTIFICADOR':
-        if not t.value in SemanticAnalyzer.return_symbol_table(SemanticAnalyzer):
-            SemanticAnalyzer.add_to_temp_symbol_table(t.value, t.lexer.lineno)
     return t
 
 def t_double(t):
@@ -149,17 +173,547 @@ def t_INT(t):
 
 def t_newline(t):
     r'\n+'
-    t.lexer.lineno += 1
+    t.lexer.lineno += len(t.value)
 
 def t_error(t):
     t.lexer.skip(1)
     t.value = "Ilegal character at '%s' in line %d column %d" % (t.value[0], t.lexer.lineno, t.lexer.lexpos + 1)
     return t
 
-def t_eof(t):
-    t.lexer.lineno = 1
-    pass
-
 t_ignore = " \t"
 
-lexer = lex.lex()
\ No newline at end of file
+lexer = tablas.build_lexer(sys.modules[__name__])
+
+# Motor léxico: 'ply' (las reglas de arriba) o 'scanner' (scanner.py)
+BACKENDS = ('ply', 'scanner')
+backend = os.environ.get('COMPILADOR_LEXER', 'ply')
+
+def set_backend(name):
+    global backend
+    if name not in BACKENDS:
+        raise ValueError(f"Motor léxico desconocido: {name}")
+    backend = name
+
+def new_lexer():
+    if backend == 'scanner':
+        from scanner import Scanner
+        return Scanner()
+    return lexer.clone()
+
+KINDS = tuple(dict.fromkeys(tokens + ['error']))
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+STATES = ('INITIAL', 'double', 'deletedot')
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+class LineIndex:
+    # Posición donde empieza cada línea del texto, ordenadas; la línea y la
+    # columna de una posición se buscan con bisect
+    def __init__(self, text):
+        self.text = text
+        self.starts = array('I', accumulate((len(line) + 1 for line in text.split('\n')), initial=0))
+        self.starts.pop()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line(self, offset):
+        return bisect_right(self.starts, offset)
+
+    def column(self, offset):
+        return offset - self.starts[bisect_right(self.starts, offset) - 1] + 1
+
+    def position(self, offset):
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+class TokenBuffer:
+    # Tokens guardados por columnas: el tipo como entero pequeño y la línea,
+    # posición y longitud en arreglos. El lexema se corta del texto fuente solo
+    # cuando se pide; los tokens de error guardan aparte su mensaje.
+    def __init__(self, source=""):
+        self.source = source
+        self.index = None
+        self.kinds = array('B')
+        self.lines = array('I')
+        self.offsets = array('I')
+        self.lengths = array('I')
+        self.errors = {}
+
+    def append(self, kind, value, lineno, lexpos, end):
+        if kind == 'error':
+            self.errors[len(self.kinds)] = value
+        self.kinds.append(KIND_CODES[kind])
+        self.lines.append(lineno)
+        self.offsets.append(lexpos)
+        self.lengths.append(max(end - lexpos, 0))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def type(self, i):
+        return KINDS[self.kinds[i]]
+
+    def value(self, i):
+        message = self.errors.get(i)
+        if message is not None:
+            return message
+        start = self.offsets[i]
+        return self.source[start:start + self.lengths[i]]
+
+    def __getitem__(self, i):
+        return (KINDS[self.kinds[i]], self.value(i), self.lines[i], self.offsets[i])
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
+
+    def extend(self, tokens, delta=0, line_delta=0):
+        # Agrega al final los tokens de otro buffer desplazados delta
+        # caracteres y line_delta líneas
+        count = len(self.kinds)
+        for i, message in tokens.errors.items():
+            self.errors[count + i] = _shift_error(message, line_delta, delta)
+        self.kinds.extend(tokens.kinds)
+        self.lengths.extend(tokens.lengths)
+        self.offsets.extend([offset + delta for offset in tokens.offsets] if delta else tokens.offsets)
+        self.lines.extend([line + line_delta for line in tokens.lines] if line_delta else tokens.lines)
+
+    def splice(self, start, tokens, keep=None, delta=0, line_delta=0):
+        # Reemplaza los tokens desde start por los de tokens y después agrega
+        # los tokens viejos desde keep, desplazados delta caracteres y line_delta líneas
+        errors = {i: message for i, message in self.errors.items() if i < start}
+        errors.update((start + i, message) for i, message in tokens.errors.items())
+        if keep is None:
+            keep = len(self.kinds)
+        shift = start + len(tokens) - keep
+        for i, message in self.errors.items():
+            if i >= keep:
+                errors[i + shift] = _shift_error(message, line_delta, delta)
+        offsets = self.offsets[keep:]
+        if delta:
+            offsets = array('I', [offset + delta for offset in offsets])
+        lines = self.lines[keep:]
+        if line_delta:
+            lines = array('I', [line + line_delta for line in lines])
+        self.kinds[start:] = tokens.kinds + self.kinds[keep:]
+        self.lengths[start:] = tokens.lengths + self.lengths[keep:]
+        self.offsets[start:] = tokens.offsets + offsets
+        self.lines[start:] = tokens.lines + lines
+        self.errors = errors
+        self.source = tokens.source
+
+    def copy(self):
+        # Copia que no cambia cuando el lexer incremental edita este buffer
+        tokens = TokenBuffer(self.source)
+        tokens.kinds = array('B', self.kinds)
+        tokens.lines = array('I', self.lines)
+        tokens.offsets = array('I', self.offsets)
+        tokens.lengths = array('I', self.lengths)
+        tokens.errors = dict(self.errors)
+        tokens.index = self.index
+        return tokens
+
+    def line_index(self):
+        # El índice de líneas de source se arma la primera vez que se pide y
+        # se vuelve a armar cuando splice cambia el texto
+        index = self.index
+        if index is None or index.text is not self.source:
+            index = self.index = LineIndex(self.source)
+        return index
+
+    def reader(self, indices=None):
+        return BufferLexer(self, indices)
+
+class BufferLexer:
+    # Permite que el parser de PLY lea directamente de un TokenBuffer, todo o
+    # solo los tokens en indices. Cada token lleva endlexpos para que el parser
+    # sepa dónde termina cada regla.
+    def __init__(self, buffer, indices=None):
+        self.buffer = buffer
+        self.indices = range(len(buffer.kinds)) if indices is None else indices
+        self.index = 0
+        self.lexpos = 0
+        self.lineno = 1
+
+    @property
+    def lexdata(self):
+        return self.buffer.source
+
+    def input(self, data):
+        self.index = 0
+
+    def token(self):
+        buffer = self.buffer
+        if self.index >= len(self.indices):
+            return None
+        i = self.indices[self.index]
+        self.index += 1
+        tok = lex.LexToken()
+        tok.type = KINDS[buffer.kinds[i]]
+        tok.value = buffer.value(i)
+        tok.lineno = self.lineno = buffer.lines[i]
+        tok.lexpos = buffer.offsets[i]
+        tok.endlexpos = self.lexpos = tok.lexpos + buffer.lengths[i]
+        tok.lexer = self
+        return tok
+
+def tokenize(text):
+    lx = new_lexer()
+    lx.input(text)
+    lx.lineno = 1
+    buffer = TokenBuffer(text)
+    for tok in iter(lx.token, None):
+        buffer.append(tok.type, tok.value, tok.lineno, tok.lexpos, lx.lexpos)
+    return buffer
+
+_MULTILINE_START = re.compile('[°"]')
+
+def split_points(text, parts):
+    # Posiciones después de un salto de línea que no está dentro de un
+    # comentario °* ... *° ni de una cadena, cerca de len(text) * i / parts.
+    # Fuera de ellos ° y " siempre abren un comentario o una cadena, así que
+    # basta saltar de uno a otro sin analizar el resto del texto.
+    starts, ends = array('I'), array('I')
+    match = _MULTILINE_START.search(text)
+    while match:
+        start = match.start()
+        if text[start] == '"':
+            close = text.find('"', start + 1)
+            end = start + 1 if close < 0 else close + 1
+        elif text.startswith('*', start + 1):
+            close = text.find('*°', start + 2)
+            end = len(text) if close < 0 else close + 2
+        else:
+            end = text.find('\n', start)
+            end = len(text) if end < 0 else end
+        if text.find('\n', start, end) >= 0:
+            starts.append(start)
+            ends.append(end)
+        match = _MULTILINE_START.search(text, end)
+
+    points = []
+    for i in range(1, parts):
+        point = text.find('\n', max(len(text) * i // parts, points[-1] if points else 0)) + 1
+        while point:
+            j = bisect_right(starts, point - 1) - 1
+            if j < 0 or ends[j] <= point - 1:
+                break
+            point = text.find('\n', ends[j]) + 1
+        if not point or point >= len(text):
+            break
+        points.append(point)
+    return points
+
+def _tokenize_chunk(args):
+    # Se ejecuta en un proceso del pool: tokens del bloque con posiciones y
+    # líneas relativas a su inicio. context es el carácter anterior al bloque.
+    name, context, chunk = args
+    set_backend(name)
+    lx = new_lexer()
+    lx.input(context + chunk)
+    lx.lexpos = 1
+    lx.lineno = 1
+    buffer = TokenBuffer()
+    for tok in iter(lx.token, None):
+        value = _shift_error(tok.value, 0, -1) if tok.type == 'error' else tok.value
+        buffer.append(tok.type, value, tok.lineno, tok.lexpos - 1, lx.lexpos - 1)
+    return buffer
+
+def available_cpus():
+    # CPUs que puede usar este proceso; en un contenedor pueden ser menos
+    # que las de la máquina
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def tokenize_parallel(text, workers=None, min_chunk=1 << 18):
+    # Divide el texto en bloques seguros, los analiza en un pool de procesos
+    # y une los resultados con sus posiciones y líneas globales. Con un solo
+    # bloque o un solo proceso no se abre el pool.
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or available_cpus()
+    parts = min(workers, len(text) // min_chunk)
+    points = split_points(text, parts) if parts > 1 else []
+    if not points:
+        return tokenize(text)
+    bounds = [0] + points + [len(text)]
+    # Al inicio del texto t_INT y t_double miran lexdata[-1], igual que en tokenize
+    jobs = [(backend, text[start - 1], text[start:end]) for start, end in zip(bounds, bounds[1:])]
+    buffer = TokenBuffer(text)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        lineno = 1
+        for start, end, chunk in zip(bounds, bounds[1:], pool.map(_tokenize_chunk, jobs)):
+            buffer.extend(chunk, start, lineno - 1)
+            lineno += text.count('\n', start, end)
+    return buffer
+
+def tokenize_file(path, chunk_size=1 << 20, encoding='utf-8'):
+    # Genera los tokens de un archivo como tuplas (tipo, valor, línea, posición)
+    # sin leerlo completo: el archivo se mapea en memoria y se decodifica por
+    # bloques que terminan en un salto de línea.
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _tokenize_mapped(data, chunk_size, encoding)
+
+def _open_token(tok, window):
+    # Un °* o unas comillas sin cerrar dentro del bloque pueden cerrarse en uno posterior
+    return tok.type == 'error' and (window[tok.lexpos] == '"' or tok.value.startswith(UNTERMINATED_COMMENT))
+
+def _tokenize_mapped(data, chunk_size, encoding):
+    size = len(data)
+    lx = new_lexer()
+    # El bloque se analiza con un carácter de contexto delante, porque t_INT y
+    # t_double miran el carácter anterior al número. Al inicio del archivo es
+    # el último carácter, igual que lexdata[-1] en tokenize.
+    context = data[max(size - 4, 0):].decode(encoding, 'ignore')[-1:] or '\n'
+    pending = ''
+    base = 0
+    pending_bytes = 0
+    read = 0
+    need = 0
+    lineno = 1
+    state = 'INITIAL'
+    while True:
+        if read < size:
+            stop = max(read + chunk_size, need)
+            if stop < size:
+                stop = data.find(b'\n', stop) + 1 or size
+            pending += data[read:stop].decode(encoding)
+            read = min(stop, size)
+        final = read >= size
+        window = context + pending
+        lx.input(window)
+        lx.lexpos = 1
+        lx.lineno = lineno
+        lx.begin(state)
+        end = 1
+        carry = False
+        while True:
+            tok = lx.token()
+            if tok is None:
+                break
+            if not final and _open_token(tok, window):
+                opener = pending_bytes + len(window[1:tok.lexpos].encode(encoding))
+                comment = tok.value.startswith(UNTERMINATED_COMMENT)
+                if comment:
+                    close = data.find('*°'.encode(encoding), opener + len('°*'.encode(encoding)))
+                    length = len('*°'.encode(encoding))
+                else:
+                    close = data.find(b'"', opener + 1)
+                    length = 1
+                if close >= 0 and close + length > read:
+                    need = close + length
+                    carry = True
+                    break
+                if comment:
+                    # El comentario sin cerrar abarca el resto del archivo
+                    yield (tok.type, _shift_error(tok.value, 0, base - 1), tok.lineno, base + tok.lexpos - 1)
+                    return
+            value = tok.value
+            if tok.type == 'error':
+                value = _shift_error(value, 0, base - 1)
+            yield (tok.type, value, tok.lineno, base + tok.lexpos - 1)
+            end, lineno, state = lx.lexpos, lx.lineno, lx.current_state()
+        if not carry:
+            if final:
+                return
+            end, lineno, state = len(window), lx.lineno, lx.current_state()
+            pending_bytes = read
+        else:
+            pending_bytes += len(window[1:end].encode(encoding))
+        context = window[end - 1]
+        pending = window[end:]
+        base += end - 1
+
+def identifier_index(tokens):
+    # Líneas y posiciones donde aparece cada identificador, en orden de aparición
+    index = {}
+    code = KIND_CODES['IDENTIFICADOR']
+    source = tokens.source
+    for i, kind in enumerate(tokens.kinds):
+        if kind != code:
+            continue
+        lexpos = tokens.offsets[i]
+        value = source[lexpos:lexpos + tokens.lengths[i]]
+        entry = index.get(value)
+        if entry is None:
+            name = sys.intern(value)
+            entry = index[name] = {"name": name, "lineno": [], "lexpos": []}
+        entry["lineno"].append(tokens.lines[i])
+        entry["lexpos"].append(lexpos)
+    return index
+
+def _common_prefix(a, b):
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _common_suffix(a, b, limit):
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _shift_error(value, line_delta, delta):
+    # Los tokens de error llevan la línea y la columna dentro del mensaje
+    head, sep, tail = value.rpartition(" in line ")
+    if not sep:
+        return value
+    line, _, column = tail.partition(" column ")
+    return "%s in line %d column %d" % (head, int(line) + line_delta, int(column) + delta)
+
+class IncrementalLexer:
+    # Lexer que solo vuelve a analizar la región editada del texto.
+    # Por cada token se guarda el estado del lexer al terminarlo (INITIAL,
+    # double o deletedot) y la posición donde terminó; el punto de control de
+    # cada línea es el último token que termina antes de ella. Un comentario
+    # °* ... *° es un solo token, así que las líneas dentro de él usan como
+    # punto de control el token anterior al comentario.
+    def __init__(self):
+        self.lexer = new_lexer()
+        self.text = ""
+        self.tokens = TokenBuffer()
+        self.ends = array('I')
+        self.states = array('B')
+
+    def checkpoint(self, offset):
+        # Número de tokens que terminan antes de la línea que contiene offset
+        line_start = self.text.rfind('\n', 0, offset) + 1
+        return bisect_left(self.ends, line_start)
+
+    def update(self, text, splicing=None):
+        # splicing(first, old_last, new_last) se llama justo antes de cambiar
+        # self.tokens: los tokens [first, old_last) pasan a ser [first, new_last)
+        old = self.text
+        if text == old:
+            return None
+
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        new_edit_end = len(text) - suffix
+        delta = len(text) - len(old)
+
+        k = min(self.checkpoint(prefix), self._unterminated_quote(prefix))
+        if suffix == 0 and text[:1] in '-0123456789':
+            # t_INT y t_double miran lexdata[-1] cuando el número está al inicio
+            k = 0
+        if k:
+            start = self.ends[k - 1]
+            # Los comentarios y cadenas pueden abarcar varias líneas
+            lineno = self.tokens.lines[k - 1] + text.count('\n', self.tokens.offsets[k - 1], start)
+            state = STATES[self.states[k - 1]]
+        else:
+            start, lineno, state = 0, 1, 'INITIAL'
+
+        lx = self.lexer
+        lx.input(text)
+        lx.lexpos = start
+        lx.lineno = lineno
+        lx.begin(state)
+
+        fresh = TokenBuffer(text)
+        ends, states = array('I'), array('B')
+        sync = None
+        # Cada salto de línea cuenta, así que los tokens después de la edición
+        # se mueven tantas líneas como saltos se agregaron o quitaron
+        line_delta = text.count('\n', prefix, new_edit_end) - old.count('\n', prefix, len(old) - suffix)
+        while True:
+            tok = lx.token()
+            if not tok:
+                break
+            end = lx.lexpos
+            state = STATE_CODES[lx.current_state()]
+            fresh.append(tok.type, tok.value, tok.lineno, tok.lexpos, end)
+            ends.append(end)
+            states.append(state)
+            # El texto desde end - 1 es igual en ambas versiones; si el lexer
+            # anterior también terminó un token ahí con el mismo estado, el
+            # resto de la secuencia de tokens es la misma desplazada.
+            if end - 1 >= new_edit_end:
+                i = bisect_left(self.ends, end - delta, k)
+                if i < len(self.ends) and self.ends[i] == end - delta and self.states[i] == state:
+                    sync = i + 1
+                    break
+
+        first = k
+        last = k + len(fresh)
+        damaged_end = ends[-1] if ends else start
+        if sync is None:
+            damaged_end = len(text)
+            self.ends[k:] = ends
+            self.states[k:] = states
+        else:
+            self.ends[k:] = ends + array('I', [e + delta for e in self.ends[sync:]])
+            self.states[k:] = states + self.states[sync:]
+        if splicing is not None:
+            splicing(first, len(self.tokens) if sync is None else sync, last)
+        self.tokens.splice(k, fresh, sync, delta, line_delta)
+        self.text = text
+        return start, damaged_end, first, last
+
+    def _unterminated_quote(self, offset):
+        # Unas comillas sin pareja son un error de un carácter, pero dependen
+        # de todo el texto que les sigue: si están antes de la edición hay que
+        # reanalizar desde ellas. Un °* sin cerrar ya abarca hasta el final.
+        text = self.text
+        tokens = self.tokens
+        quote = text.rfind('"', 0, offset)
+        if quote >= 0:
+            i = bisect_right(self.ends, quote)
+            if i < len(tokens) and tokens.offsets[i] == quote and tokens.kinds[i] == KIND_CODES['error']:
+                return i
+        return len(tokens)
+
+# Estado con el que termina una línea del editor: código, o dentro de un
+# comentario °* ... *° o de una cadena que siguen en la línea siguiente
+LINE_CODE, LINE_COMMENT, LINE_STRING = range(3)
+
+class LineLexer:
+    # Lexer de una línea a la vez para el resaltado del editor. Un comentario
+    # de bloque o unas comillas que no se cierran en la línea se toman como
+    # abiertos hasta la línea donde se cierren.
+    def __init__(self):
+        self.lexer = new_lexer()
+
+    def tokens(self, text, state=LINE_CODE):
+        # Devuelve los tokens de la línea como (posición, longitud, tipo) y el
+        # estado con el que empieza la siguiente
+        spans = []
+        start = 0
+        if state != LINE_CODE:
+            kind, close = ('COMENTARIO', '*°') if state == LINE_COMMENT else ('STRING', '"')
+            end = text.find(close)
+            if end < 0:
+                spans.append((0, len(text), kind))
+                return spans, state
+            start = end + len(close)
+            spans.append((0, start, kind))
+        # La línea va detrás de un salto, como dentro del texto completo:
+        # t_INT y t_double miran el carácter anterior al número
+        window = '\n' + text
+        lx = self.lexer
+        lx.input(window)
+        lx.lexpos = start + 1
+        lx.lineno = 1
+        lx.begin('INITIAL')
+        for tok in iter(lx.token, None):
+            if _open_token(tok, window):
+                if window[tok.lexpos] == '"':
+                    kind, state = 'STRING', LINE_STRING
+                else:
+                    kind, state = 'COMENTARIO', LINE_COMMENT
+                spans.append((tok.lexpos - 1, len(window) - tok.lexpos, kind))
+                return spans, state
+            spans.append((tok.lexpos - 1, max(lx.lexpos - tok.lexpos, 0), tok.type))
+        return spans, LINE_CODE
@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ASSIGN', 'CASE', 'CIN', 'COMENTARIO', 'COMMA', 'COUT', 'DEC', 'DO', 'DOUBLE', 'ELSE', 'END', 'ENTRE', 'EQUALS', 'IDENTIFICADOR', 'IF', 'INC', 'INT', 'LBRACE', 'LBRACKET', 'LESSEQUALS', 'LESSTHAN', 'LPARENT', 'MAIN', 'MAS', 'MENOS', 'MOD', 'MOREEQUALS', 'MORETHAN', 'NOT', 'NOTEQUALS', 'OR', 'PIPE', 'POR', 'POT', 'RBRACE', 'RBRACKET', 'RPARENT', 'SEMICOLON', 'SHAFT', 'STRING', 'SWITCH', 'THEN', 'UNDERSCORE', 'UNTIL', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive', 'double': 'exclusive', 'deletedot': 'exclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMENTARIO>\\°.*)|(?P<t_STRING>\\"[^\\"]*\\")|(?P<t_IDENTIFICADOR>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_double>\\d+\\.)|(?P<t_INT>-?\\d+)|(?P<t_newline>\\n+)|(?P<t_INC>\\+\\+)|(?P<t_AND>and)|(?P<t_DEC>--)|(?P<t_EQUALS>==)|(?P<t_LBRACE>\\{)|(?P<t_LBRACKET>\\[)|(?P<t_LESSEQUALS><=)|(?P<t_LPARENT>\\()|(?P<t_MAS>\\+)|(?P<t_MOREEQUALS>>=)|(?P<t_NOTEQUALS>!=)|(?P<t_OR>or)|(?P<t_PIPE>\\|)|(?P<t_POR>\\*)|(?P<t_POT>\\^)|(?P<t_RBRACE>\\})|(?P<t_RBRACKET>\\])|(?P<t_RPARENT>\\))|(?P<t_ASSIGN>=)|(?P<t_COMMA>,)|(?P<t_ENTRE>/)|(?P<t_LESSTHAN><)|(?P<t_MENOS>-)|(?P<t_MOD>%)|(?P<t_MORETHAN>>)|(?P<t_NOT>!)|(?P<t_SEMICOLON>;)|(?P<t_SHAFT>°)|(?P<t_UNDERSCORE>_)', [None, ('t_COMENTARIO', 'COMENTARIO'), ('t_STRING', 'STRING'), ('t_IDENTIFICADOR', 'IDENTIFICADOR'), ('t_double', 'double'), ('t_INT', 'INT'), ('t_newline', 'newline'), (None, 'INC'), (None, 'AND'), (None, 'DEC'), (None, 'EQUALS'), (None, 'LBRACE'), (None, 'LBRACKET'), (None, 'LESSEQUALS'), (None, 'LPARENT'), (None, 'MAS'), (None, 'MOREEQUALS'), (None, 'NOTEQUALS'), (None, 'OR'), (None, 'PIPE'), (None, 'POR'), (None, 'POT'), (None, 'RBRACE'), (None, 'RBRACKET'), (None, 'RPARENT'), (None, 'ASSIGN'), (None, 'COMMA'), (None, 'ENTRE'), (None, 'LESSTHAN'), (None, 'MENOS'), (None, 'MOD'), (None, 'MORETHAN'), (None, 'NOT'), (None, 'SEMICOLON'), (None, 'SHAFT'), (None, 'UNDERSCORE')])], 'double': [('(?P<t_double_isdouble>\\d+)', [None, ('t_double_isdouble', 'isdouble')])], 'deletedot': [('(?P<t_deletedot_delete>\\.)', [None, ('t_deletedot_delete', 'delete')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'double': 't_double_error', 'INITIAL': 't_error'}
+_lexstateeoff = {}
+_lexsignature = '[\'COMENTARIO\', \'IDENTIFICADOR\', \'DOUBLE\', \'INT\', \'SHAFT\', \'COMMA\', \'UNDERSCORE\', \'NOT\', \'LPARENT\', \'RPARENT\', \'LBRACE\', \'RBRACE\', \'LBRACKET\', \'RBRACKET\', \'PIPE\', \'INC\', \'DEC\', \'MAS\', \'MENOS\', \'ENTRE\', \'POR\', \'MOD\', \'POT\', \'ASSIGN\', \'MORETHAN\', \'LESSTHAN\', \'MOREEQUALS\', \'LESSEQUALS\', \'EQUALS\', \'NOTEQUALS\', \'AND\', \'OR\', \'SEMICOLON\', \'STRING\', \'IF\', \'ELSE\', \'DO\', \'THEN\', \'END\', \'SWITCH\', \'CASE\', \'INT\', \'DOUBLE\', \'MAIN\', \'CIN\', \'COUT\', \'WHILE\', \'UNTIL\', \'AND\', \'OR\']\n((\'double\', \'exclusive\'), (\'deletedot\', \'exclusive\'))\n\' \\t\'\nt_COMENTARIO \\°.*\nt_STRING \\"[^\\"]*\\"\nt_IDENTIFICADOR [a-zA-Z_][a-zA-Z_0-9]*\nt_double \\d+\\.\nt_double_isdouble \\d+\nt_double_error \nt_deletedot_delete \\.\nt_INT -?\\d+\nt_newline \\n+\nt_error \nt_AND and\nt_ASSIGN =\nt_COMMA ,\nt_DEC --\nt_ENTRE /\nt_EQUALS ==\nt_INC \\+\\+\nt_LBRACE \\{\nt_LBRACKET \\[\nt_LESSEQUALS <=\nt_LESSTHAN <\nt_LPARENT \\(\nt_MAS \\+\nt_MENOS -\nt_MOD %\nt_MOREEQUALS >=\nt_MORETHAN >\nt_NOT !\nt_NOTEQUALS !=\nt_OR or\nt_PIPE \\|\nt_POR \\*\nt_POT \\^\nt_RBRACE \\}\nt_RBRACKET \\]\nt_RPARENT \\)\nt_SEMICOLON ;\nt_SHAFT °\nt_UNDERSCORE _'
@@ -1,13 +1,15 @@
 from PyQt5.QtCore import Qt, QStandardPaths
-from PyQt5.QtGui import QTextCharFormat, QColor, QTextCursor, QStandardItemModel, QStandardItem
-from PyQt5.QtWidgets import QMainWindow, QApplication, QFileDialog, QTextEdit, QPlainTextEdit, QHBoxLayout, QVBoxLayout, QSizePolicy, QWidget, QTreeView, QHeaderView, QInputDialog
+from PyQt5.QtGui import QTextCharFormat, QColor, QSyntaxHighlighter
+from PyQt5.QtWidgets import QMainWindow, QApplication, QFileDialog, QTextEdit, QPlainTextEdit, QHBoxLayout, QVBoxLayout, QSizePolicy, QWidget, QTreeView, QTableView, QHeaderView, QInputDialog
 from PyQt5.uic import loadUi
 import sys
 import os
 
-from lexer import lexer
-from sint import parser, set_error_output
-from sem import SemanticAnalyzer
+from lexer import IncrementalLexer, LineLexer, LINE_CODE
+from arbol import Node
+from pipeline import CompilationPipeline
+from modelos import TreeModel, TokenTableModel, SymbolTableModel
+from planificador import AnalysisScheduler, CompilationRunner
 
 class NoScrollTextEdit(QTextEdit):
     def __init__(self, parent=None):
@@ -16,257 +18,28 @@ class NoScrollTextEdit(QTextEdit):
     def wheelEvent(self, event):
         pass
 
-class CodeGenerator:
-    def __init__(self):
-        self.code_p = []
-        self.label_counter = 0
-
-    def generate_code(self, syntax_tree):
-        self.code_p = []
-        self.label_counter = 0
-        self.traverse_tree(syntax_tree)
-        return self.code_p
-
-    def new_label(self):
-        label = f"LABEL_{self.label_counter}"
-        self.label_counter += 1
-        return label
-
-    def traverse_tree(self, node):
-        if not node:
-            return
-
-        if isinstance(node, tuple):
-            node_type = node[0]
-
-            if node_type == 'programa':
-                for declaration in node[1]:
-                    self.traverse_tree(declaration)
-
-            elif node_type == '=':
-                var_name = node[1]
-                expr = node[2]
-                self.traverse_tree(expr)
-                self.code_p.append(f"STORE {var_name}")
-
-            elif node_type in ('+', '-', '*', '/', '%'):
-                self.traverse_tree(node[1])
-                self.traverse_tree(node[2])
-                operation = {'+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV', '%': 'MOD'}[node_type]
-                self.code_p.append(operation)
-
-            elif node_type == 'if-else':
-                self.traverse_tree(node[1])  # Condición
-                label_else = self.new_label()
-                self.code_p.append(f"JMPZ {label_else}")
-                self.traverse_tree(node[2])  # Rama if
-                label_end = self.new_label()
-                self.code_p.append(f"JMP {label_end}")
-                self.code_p.append(f"{label_else}:")
-                self.traverse_tree(node[3])  # Rama else
-                self.code_p.append(f"{label_end}:")
-
-            elif node_type == 'while':
-                label_start = self.new_label()
-                self.code_p.append(f"{label_start}:")
-                self.traverse_tree(node[1])  # Condición
-                label_end = self.new_label()
-                self.code_p.append(f"JMPZ {label_end}")
-                self.traverse_tree(node[2])  # Cuerpo
-                self.code_p.append(f"JMP {label_start}")
-                self.code_p.append(f"{label_end}:")
-
-            elif node_type == 'do-until':
-                label_start = self.new_label()
-                self.code_p.append(f"{label_start}:")
-                self.traverse_tree(node[1])  # Cuerpo
-                self.traverse_tree(node[2])  # Condición
-                self.code_p.append(f"JMPZ {label_start}")
-
-            elif node_type == 'cout':
-                if isinstance(node[1], str) and node[1].startswith('"') and node[1].endswith('"'):
-                    # Es un literal de texto
-                    self.code_p.append(f'PUSH {node[1]}')
-                else:
-                    # Es una variable o expresión
-                    self.traverse_tree(node[1])
-                self.code_p.append("PRINT")
-
-            elif node_type == 'cin':
-                var_name = node[1]
-                self.code_p.append(f"CIN {var_name}")
-
-
-            elif node_type == 'relacion':
-                # Relación como '>', '<', '==', etc.
-                self.traverse_tree(node[2][0])  # Lado izquierdo
-                self.traverse_tree(node[2][1])  # Lado derecho
-                operador = {
-                    '>': 'GT',
-                    '<': 'LT',
-                    '>=': 'GE',
-                    '<=': 'LE',
-                    '==': 'EQ',
-                    '!=': 'NE'
-                }[node[1]]
-                self.code_p.append(operador)
-
-            elif node_type == 'incremento':
-                var_name = node[1]
-                self.code_p.append(f"LOAD {var_name}")
-                self.code_p.append("PUSH 1")
-                self.code_p.append("ADD")
-                self.code_p.append(f"STORE {var_name}")
-
-            elif node_type == 'decremento':
-                var_name = node[1]
-                self.code_p.append(f"LOAD {var_name}")
-                self.code_p.append("PUSH 1")
-                self.code_p.append("SUB")
-                self.code_p.append(f"STORE {var_name}")
-
-
-        elif isinstance(node, list):
-            for element in node:
-                self.traverse_tree(element)
-
-        elif isinstance(node, str):
-            if node.isdigit() or node.replace('.', '', 1).isdigit():
-                self.code_p.append(f"PUSH {node}")
-            else:
-                self.code_p.append(f"LOAD {node}")
-
-
-class StackMachine:
-    def __init__(self):
-        self.stack = []
-        self.variables = {}
-        self.output = []
-        self.errors = []
-
-    def execute(self, code_p):
-        pc = 0
-        labels = {line.split(':', 1)[0]: idx for idx, line in enumerate(code_p) if line.strip().endswith(':')}
-        while pc < len(code_p):
-            try:
-                instruction = code_p[pc]
-                parts = instruction.split()
-                command = parts[0]
-
-                print(f"Instrucción: {instruction}")
-                print(f"Pila antes: {self.stack}")
-                print(f"Variables: {self.variables}")
-
-                if command == "PUSH":
-                    value = " ".join(parts[1:])
-                    if value.startswith('"') and value.endswith('"'):
-                        # Es una cadena de texto
-                        self.stack.append(value.strip('"'))
-                    elif value in self.variables:
-                        # Es una variable
-                        self.stack.append(self.variables[value])
-                    else:
-                        # Es un número
-                        self.stack.append(float(value) if '.' in value else int(value))
-
-
-                elif command == "LOAD":
-                    var_name = parts[1]
-                    if var_name not in self.variables:
-                        raise KeyError(f"Variable no inicializada: {var_name}")
-                    self.stack.append(self.variables[var_name])
-
-                elif command == "STORE":
-                    var_name = parts[1]
-                    if not self.stack:
-                        raise IndexError("Pila vacía durante operación STORE.")
-                    self.variables[var_name] = self.stack.pop()
-
-                elif command == "PRINT":
-                    if not self.stack:
-                        raise IndexError("Pila vacía durante operación PRINT.")
-                    value = self.stack.pop()
-                    if isinstance(value, (int, float)):
-                        self.output.append(str(value))
-                    else:
-                        self.output.append(value)
-
-                elif command == "CIN":
-                    print(f"Solicitando entrada para la variable '{parts[1]}'")
-                    var_name = parts[1]
-                    if hasattr(self, "input_callback"):
-                        input_value = self.input_callback(var_name)
-                        try:
-                            self.variables[var_name] = float(input_value) if '.' in input_value else int(input_value)
-                            print(f"Entrada recibida: {input_value}")
-                        except ValueError:
-                            raise ValueError(f"Entrada inválida para la variable '{var_name}': {input_value}")
-                    else:
-                        raise ValueError("No se configuró ningún callback para manejar la entrada.")
-
-                elif command in ("ADD", "SUB", "MUL", "DIV", "MOD"):
-                    if len(self.stack) < 2:
-                        raise IndexError(f"Pila insuficiente para operación {command}.")
-                    b = self.stack.pop()
-                    a = self.stack.pop()
-                    result = {
-                        "ADD": a + b,
-                        "SUB": a - b,
-                        "MUL": a * b,
-                        "DIV": a / b if b != 0 else 0,
-                        "MOD": a % b,
-                    }[command]
-                    self.stack.append(result)
-
-                elif command in ("GT", "LT", "GE", "LE", "EQ", "NE"):
-                    if len(self.stack) < 2:
-                        raise IndexError(f"Pila insuficiente para operación {command}.")
-                    b = self.stack.pop()
-                    a = self.stack.pop()
-                    result = {
-                        "GT": a > b,
-                        "LT": a < b,
-                        "GE": a >= b,
-                        "LE": a <= b,
-                        "EQ": a == b,
-                        "NE": a != b
-                    }[command]
-                    self.stack.append(1 if result else 0)
-
-                elif command == "JMP":
-                    if parts[1] not in labels:
-                        raise ValueError(f"Etiqueta no encontrada: {parts[1]}")
-                    pc = labels[parts[1]]
-                    continue
-
-                elif command == "JMPZ":
-                    if not self.stack:
-                        raise IndexError("Pila vacía durante operación JMPZ.")
-                    if not self.stack.pop():
-                        if parts[1] not in labels:
-                            raise ValueError(f"Etiqueta no encontrada: {parts[1]}")
-                        pc = labels[parts[1]]
-                        continue
-
-                elif instruction.endswith(":"):
-                    pass  # Etiquetas
-
-                else:
-                    raise ValueError(f"Instrucción desconocida: {command}")
-
-                print(f"Pila después: {self.stack}")
-                print(f"Salida: {self.output}")
-
-                pc += 1
-
-            except Exception as e:
-                error_message = f"Error en ejecución: {e}"
-                print(error_message)
-                self.errors.append(error_message)  # Agregar error a la lista
-                break
-
-        return self.output
-
+class Highlighter(QSyntaxHighlighter):
+    # Colorea el editor línea por línea con el lexer del proyecto. El estado
+    # de cada bloque dice si termina dentro de un comentario °* ... *° o de
+    # una cadena; Qt solo vuelve a colorear los bloques siguientes a una
+    # edición mientras ese estado cambie. Hay un formato por tipo de token.
+    def __init__(self, document, colors):
+        super(Highlighter, self).__init__(document)
+        self.lexer = LineLexer()
+        self.formats = {}
+        for kind, color in colors.items():
+            format = QTextCharFormat()
+            format.setForeground(color)
+            self.formats[kind] = format
+
+    def highlightBlock(self, text):
+        # El primer bloque no tiene estado anterior (-1)
+        spans, state = self.lexer.tokens(text, max(self.previousBlockState(), LINE_CODE))
+        for start, length, kind in spans:
+            format = self.formats.get(kind)
+            if format is not None:
+                self.setFormat(start, length, format)
+        self.setCurrentBlockState(state)
 
 class Main(QMainWindow):
     def __init__(self):
@@ -278,6 +51,11 @@ class Main(QMainWindow):
         
         self.current_path = None
         self.current_fontSize = 10
+        # Niveles de los árboles que se abren al mostrarlos; las demás ramas
+        # se construyen cuando se expanden
+        self.tree_depth = 1
+        self.syntax_model = None
+        self.semantic_model = None
         self.setWindowTitle("Compilador")
         self.showMaximized() 
         
@@ -308,6 +86,7 @@ class Main(QMainWindow):
         tree_view.header().setDefaultAlignment(Qt.AlignCenter)
         tree_view.header().setStretchLastSection(True)
         tree_view.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tree_view.setUniformRowHeights(True)
 
         tree_view2 = self.tabCompilacion.findChild(QWidget, "tabSemantico").findChild(QTreeView, "txtSemantico")
         tree_view2.setAlternatingRowColors(True)
@@ -315,6 +94,7 @@ class Main(QMainWindow):
         tree_view2.header().setDefaultAlignment(Qt.AlignCenter)
         tree_view2.header().setStretchLastSection(True)
         tree_view2.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tree_view2.setUniformRowHeights(True)
         
         self.listNumeroLinea = NoScrollTextEdit(self.centralwidget)
         self.listNumeroLinea.setReadOnly(True)
@@ -348,9 +128,28 @@ class Main(QMainWindow):
 
         self.set_default_font_size()
         
-        self.textCodigoFuente.textChanged.connect(self.analyzeText)
-        
-        self.band = 0
+        self.incremental_lexer = IncrementalLexer()
+        # La compilación corre en otro hilo; al editar se cancela la que esté
+        # en curso y su resultado ya no se muestra
+        self.compiler = CompilationRunner(CompilationPipeline(), parent=self)
+        self.compiler.finished.connect(self.show_compilation)
+        self.compiler.input_requested.connect(self.request_input)
+        self.textCodigoFuente.textChanged.connect(self.compiler.cancel)
+        # Las ediciones seguidas se juntan en un solo análisis léxico; el
+        # resaltado de los bloques editados no espera. scheduler.delay es la
+        # ventana en ms y scheduler.coalesced cuenta las ediciones juntadas.
+        self.scheduler = AnalysisScheduler(self.analyzeText, delay=150, parent=self)
+        self.textCodigoFuente.textChanged.connect(self.scheduler.schedule)
+
+        # Las tablas de lexemas y de símbolos leen el buffer del lexer y la
+        # tabla del analizador; la vista solo pinta las filas visibles
+        self.token_model = TokenTableModel(self.incremental_lexer.tokens)
+        self.symbol_model = SymbolTableModel()
+        for tab, name, model in (("tabLexico", "txtLexico", self.token_model), ("tabHash", "txtHash", self.symbol_model)):
+            table_view = self.tabCompilacion.findChild(QWidget, tab).findChild(QTableView, name)
+            table_view.setModel(model)
+            table_view.verticalHeader().setVisible(False)
+            table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         self.token_formats = {
             'DOUBLE': QColor(45, 132, 214),
@@ -387,89 +186,58 @@ class Main(QMainWindow):
             'AND': QColor(184, 22, 87),
             'OR': QColor(184, 22, 87),
         }
-    
-    def restart_timer(self):
-        self.timer.start()
+        self.highlighter = Highlighter(self.textCodigoFuente.document(), self.token_formats)
     
     def analyzeText(self):
+        # El color lo pone self.highlighter bloque por bloque; aquí solo se
+        # actualizan los tokens y las filas de la tabla de lexemas que cambiaron
         text = self.textCodigoFuente.toPlainText()
-        
-        if not text:
-            self.tabCompilacion.findChild(QWidget, "tabLexico").findChild(QTextEdit, "txtLexico").setHtml("")
+        damaged = self.incremental_lexer.update(text, self.token_model.splicing)
+        if damaged is None:
             return
-        
-        try:
-            if self.band == 0:
-                cursor = self.textCodigoFuente.textCursor()
-                self.band = 1
-            
-            cursor.select(QTextCursor.SelectionType.Document)
-            cursor.setCharFormat(QTextCharFormat())
-            cursor.clearSelection()
-            
-            lexer.input(text)
-            
-            lexemes = []
-            while True:
-                tok = lexer.token()
-                if not tok:
-                    break
-                lexemes.append((tok.type, tok.value, tok.lineno, tok.lexpos))
-                cursor.setPosition(tok.lexpos)
-                start = tok.lexpos
-                end = start + len(tok.value)
-                if tok.type in self.token_formats:
-                    self.apply_format(cursor, start, end, self.token_formats[tok.type])
-            
-            html_table = "<table style='border-collapse: collapse;' width='100%'><tr style='color: #1155d4; font-size: 15px'><th style='padding: 8px;'>Tipo</th><th style='padding: 8px;'>Valor</th><th style='padding: 8px;'>Línea</th><th style='padding: 8px;'>Posición</th></tr>"
-            for lexeme in lexemes:
-                html_table += f"<tr><td style='text-align: center; padding: 5px; font-weight: bold;'>{lexeme[0]}</td><td style='text-align: center; padding: 5px; font-weight: bold; color: #c4213f;'>{lexeme[1]}</td><td style='text-align: center; padding: 5px;'>{lexeme[2]}</td><td style='text-align: center; padding: 5px;'>{lexeme[3]}</td></tr>"
-            html_table += "</table>"
-
-            scroll_position = self.tabCompilacion.findChild(QWidget, "tabLexico").findChild(QTextEdit, "txtLexico").verticalScrollBar().value()
-            self.tabCompilacion.findChild(QWidget, "tabLexico").findChild(QTextEdit, "txtLexico").setHtml(html_table)
-            self.tabCompilacion.findChild(QWidget, "tabLexico").findChild(QTextEdit, "txtLexico").verticalScrollBar().setValue(scroll_position)
-            self.band = 0
-        except Exception as e:
-            print("ERROR: ", e)
+        start, end, first, last = damaged
+        self.token_model.update(first, last)
     
+    def current_tokens(self, text):
+        # Los tokens del editor ya están al día salvo que el texto haya
+        # cambiado; el hilo de compilación recibe una copia
+        self.scheduler.flush()
+        if self.incremental_lexer.text == text:
+            return self.incremental_lexer.tokens.copy()
+        return None
+
     def sintax_analize(self):
-        global syntax_errors    
         text = self.textCodigoFuente.toPlainText()
-                
-        self.txtErroresSint.clear()
-        
-        result = parser.parse(text)
-        print('ARBOL SINTACTICO:\n', result)
-        
-        self.show_syntax_tree(result)
-        self.semantic_analize()
-        self.generate_and_execute_code()
-    
-    def semantic_analize(self):
-        analyzer = SemanticAnalyzer()
-        analyzer.clean_temp_sym_table()
-        text = self.textCodigoFuente.toPlainText()
-        result = parser.parse(text)
-        annotated_tree = analyzer.analyze(result)
-        annotated_root = analyzer.build_annotated_tree(annotated_tree)
-        tree_view2 = self.tabCompilacion.findChild(QWidget, "tabSemantico").findChild(QTreeView, "txtSemantico")
-        model = QStandardItemModel()
-        model.setHorizontalHeaderLabels(['Árbol Sintáctico con Anotaciones'])
+        self.compiler.submit(text, self.current_tokens(text))
+
+    def show_compilation(self, job):
+        if not self.compiler.current(job):
+            return
+        self.syntax_errors = job.syntax_errors
+        self.txtErroresSint.setPlainText("\n".join(job.syntax_errors))
+        print('ARBOL SINTACTICO:\n', job.tree)
 
-        model.appendRow(annotated_root)
+        self.show_syntax_tree(job.tree)
+        self.show_semantic_tree(job)
+        self.show_execution(job)
 
-        self.tabCompilacion.findChild(QWidget, "tabHash").findChild(QTextEdit, "txtHash").setHtml(analyzer.print_symbol_table())
+    def show_semantic_tree(self, job):
+        analyzer = job.analyzer
+        tree_view2 = self.tabCompilacion.findChild(QWidget, "tabSemantico").findChild(QTreeView, "txtSemantico")
+        # Sin árbol sintáctico no hubo análisis semántico: las vistas quedan vacías
+        if analyzer is None:
+            self.semantic_model = TreeModel(None, None, None, 'Árbol Sintáctico con Anotaciones')
+            self.symbol_model.update([])
+            errors = []
+        else:
+            # La vista no es dueña del modelo: se guarda mientras se muestra
+            self.semantic_model = TreeModel(job.annotated_tree, analyzer.annotated_children, analyzer.annotated_text, 'Árbol Sintáctico con Anotaciones')
+            self.symbol_model.update(analyzer.return_symbol_table())
+            errors = analyzer.print_errors()
         
-        tree_view2.setModel(model)
-        tree_view2.expandAll()
+        tree_view2.setModel(self.semantic_model)
+        tree_view2.expandToDepth(self.tree_depth)
 
-        tree_view2.setAlternatingRowColors(True)
-        tree_view2.setStyleSheet("QTreeView { alternate-background-color: #f0f0f0; }")
-        tree_view2.header().setDefaultAlignment(Qt.AlignCenter)
-        tree_view2.header().setStretchLastSection(True)
-        tree_view2.header().setSectionResizeMode(QHeaderView.ResizeToContents)
-        errors = analyzer.print_errors()
         if errors:
             errors = "\n".join(errors)
         else:
@@ -478,94 +246,65 @@ class Main(QMainWindow):
     
     def show_syntax_tree(self, tree):
         tree_view = self.tabCompilacion.findChild(QWidget, "tabSintactico").findChild(QTreeView, "txtSintactico")
-        model = QStandardItemModel()
-        model.setHorizontalHeaderLabels(['Árbol Sintáctico'])
+        self.syntax_model = TreeModel(tree, self.syntax_children, self.syntax_text, 'Árbol Sintáctico')
 
-        root_item = self.add_items(tree)
-        model.appendRow(root_item)
-
-        tree_view.setModel(model)
-        tree_view.expandAll()
-
-        tree_view.setAlternatingRowColors(True) 
-        tree_view.setStyleSheet("QTreeView { alternate-background-color: #f0f0f0; }")
-        tree_view.header().setDefaultAlignment(Qt.AlignCenter)
-        tree_view.header().setStretchLastSection(True)
-        tree_view.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tree_view.setModel(self.syntax_model)
+        tree_view.expandToDepth(self.tree_depth)
         
-    def add_items(self, element):
-        if element is None:
-            return None
-
-        if isinstance(element, tuple):
-            item = QStandardItem(str(element[0]))
-            for child in element[1:]:
-                child_item = self.add_items(child)
-                if child_item is not None: 
-                    item.appendRow(child_item)
+    def syntax_children(self, element):
+        # Hijos de una fila del árbol sintáctico para TreeModel
+        if isinstance(element, Node):
+            children = element.children()
         elif isinstance(element, list):
-            item = QStandardItem("lista_declaraciones")
-            for subelement in element:
-                subitem = self.add_items(subelement)
-                if subitem is not None: 
-                    item.appendRow(subitem)
+            children = element
         else:
-            item = QStandardItem(str(element))
-        return item
-
-    def generate_and_execute_code(self):
-        text = self.textCodigoFuente.toPlainText()
-        try:
-            syntax_tree = parser.parse(text)
-            if not syntax_tree:
-                raise ValueError("Árbol sintáctico no generado. Revisa el código fuente.")
-            print("Árbol Sintáctico:", syntax_tree)
-
-            # Generar código P
-            code_generator = CodeGenerator()
-            code_p = code_generator.generate_code(syntax_tree)
-
-            # Ejecutar código P
-            stack_machine = StackMachine()
-            stack_machine.input_callback = self.input_callback
-            result_output = stack_machine.execute(code_p)
-
-            error_widget = self.tabErroresResultado.findChild(QWidget, "tabErroresEjecucion").findChild(QPlainTextEdit, "txtErroresEjecucion")
-            if stack_machine.errors:
-                errors = "\n".join(stack_machine.errors)
-                error_widget.setPlainText(errors)
-            else:
-                error_widget.setPlainText("Sin errores en ejecución.")
+            return []
+        return [child for child in children if child is not None]
+
+    def syntax_text(self, element):
+        if isinstance(element, Node):
+            return str(element.label)
+        if isinstance(element, list):
+            return "lista_declaraciones"
+        return str(element)
+
+    def show_execution(self, job):
+        # El código P y la máquina de pila ya corrieron en el hilo de compilación
+        if job.error is not None:
+            print(f"Error: {job.error}")
+            return
+        code_p = job.code
+        stack_machine = job.machine
 
-            # Mostrar resultados
-            self.tabCompilacion.findChild(QWidget, "tabCodigoP").findChild(QTextEdit, "txtCodigoP").setPlainText("\n".join(code_p))
-            self.tabCompilacion.findChild(QWidget, "tabResultados").findChild(QTextEdit, "txtResultados").setPlainText("\n".join(map(str, result_output)))
+        error_widget = self.tabErroresResultado.findChild(QWidget, "tabErroresEjecucion").findChild(QPlainTextEdit, "txtErroresEjecucion")
+        if stack_machine.errors:
+            errors = "\n".join(stack_machine.errors)
+            error_widget.setPlainText(errors)
+        else:
+            error_widget.setPlainText("Sin errores en ejecución.")
 
-        except Exception as e:
-            print(f"Error: {e}")
+        # Mostrar resultados
+        self.tabCompilacion.findChild(QWidget, "tabCodigoP").findChild(QTextEdit, "txtCodigoP").setPlainText("\n".join(code_p))
+        self.tabCompilacion.findChild(QWidget, "tabResultados").findChild(QTextEdit, "txtResultados").setPlainText("\n".join(map(str, stack_machine.output)))
 
-    def input_callback(self, var_name):
-        # Muestra un mensaje en txtResultados pidiendo un valor
+    def request_input(self, job, var_name):
+        # La máquina de pila espera en el hilo de compilación hasta que llegue
+        # la respuesta; None cancela la entrada
+        if not self.compiler.current(job):
+            self.compiler.answer(job, None)
+            return
         value, ok = QInputDialog.getText(self, "Entrada requerida", f"Ingrese un valor para '{var_name}':")
-        if ok:
-            return value
-        else:
-            raise ValueError(f"Se canceló la entrada para la variable '{var_name}'")
+        self.compiler.answer(job, value if ok else None)
+
+    def closeEvent(self, event):
+        self.compiler.shutdown()
+        super().closeEvent(event)
 
-    
     def show_syntax_errors(self):
-        global syntax_errors
-        error_text = "\n".join(syntax_errors)
+        error_text = "\n".join(self.syntax_errors)
         self.tabErroresResultado.findChild(QWidget, "tabErrorSintactico").findChild(QPlainTextEdit, "txtErroresSintactico").setPlainText(error_text)
 
 
-    def apply_format(self, cursor, start, end, color):
-        format = QTextCharFormat()
-        format.setForeground(color)
-        cursor.setPosition(start)
-        cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, end - start)
-        cursor.setCharFormat(format)
-
     def syncScrollBars(self):
         value = self.textCodigoFuente.verticalScrollBar().value()
         self.listNumeroLinea.verticalScrollBar().setValue(value)
@@ -625,10 +364,10 @@ class Main(QMainWindow):
         self.textCodigoFuente.paste()
         
     def onTextChanged(self):
-        text = self.textCodigoFuente.toPlainText()
-        lines = text.split('\n')
-        if len(lines) != len(self.line_numbers):
-            self.line_numbers = list(range(1, len(lines) + 1))
+        # Un bloque por línea: no hace falta copiar ni partir el texto
+        lines = self.textCodigoFuente.document().blockCount()
+        if lines != len(self.line_numbers):
+            self.line_numbers = list(range(1, lines + 1))
             self.updateLineNumbers()
             
     def onCursorChange(self):
@@ -0,0 +1,230 @@
+from PyQt5.QtCore import Qt, QAbstractItemModel, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont
+
+class TreeRow:
+    # Fila de un TreeModel. Los hijos se calculan la primera vez que la vista
+    # pregunta por ellos y cada fila hija se crea cuando la vista la pide.
+    __slots__ = ('parent', 'number', 'element', 'text', 'children', 'rows')
+
+    def __init__(self, parent, number, element):
+        self.parent = parent
+        self.number = number
+        self.element = element
+        self.text = None
+        self.children = None
+        self.rows = None
+
+class TreeModel(QAbstractItemModel):
+    # Modelo de solo lectura sobre un árbol de Python, de una columna.
+    # children(element) devuelve la lista de hijos de un elemento y
+    # text(element) el texto de su fila. Solo se visitan las ramas que la
+    # vista expande, así que mostrar el árbol cuesta lo que se ve en pantalla
+    # y no lo que mide el árbol.
+    def __init__(self, root, children, text, title, parent=None):
+        super().__init__(parent)
+        self.children_of = children
+        self.text_of = text
+        self.title = title
+        self.root = TreeRow(None, 0, None)
+        self.root.children = [] if root is None else [root]
+        self.root.rows = [None] * len(self.root.children)
+
+    def row_of(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def expand(self, row):
+        if row.children is None:
+            row.children = self.children_of(row.element)
+            row.rows = [None] * len(row.children)
+        return row.children
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.root.children)
+        if parent.column() > 0:
+            return 0
+        row = parent.internalPointer()
+        children = row.children
+        if children is None:
+            children = self.expand(row)
+        return len(children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_row = self.row_of(parent)
+        children = self.expand(parent_row)
+        if column != 0 or not 0 <= row < len(children):
+            return QModelIndex()
+        child = parent_row.rows[row]
+        if child is None:
+            child = parent_row.rows[row] = TreeRow(parent_row, row, children[row])
+        return self.createIndex(row, column, child)
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_row = index.internalPointer().parent
+        if parent_row is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_row.number, 0, parent_row)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = index.internalPointer()
+        if row.text is None:
+            row.text = self.text_of(row.element)
+        return row.text
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self.title
+        return None
+
+class TableModel(QAbstractTableModel):
+    # Tabla de solo lectura. Las subclases definen headers y data(); cuando
+    # sus datos cambian avisan a las vistas solo de las filas afectadas con
+    # begin_replace antes del cambio y end_replace después, y la vista vuelve
+    # a pintar las que están en pantalla.
+    headers = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.count = 0
+        self.replacing = None
+        self.gap = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.headers[section]
+            if role == Qt.ForegroundRole:
+                return QColor(17, 85, 212)
+            return None
+        return super().headerData(section, orientation, role)
+
+    def begin_replace(self, first, old_end, new_end):
+        # Las filas [first, old_end) se van a cambiar por [first, new_end).
+        # Se llama antes de cambiar los datos, como pide Qt con begin*Rows;
+        # end_replace(count) se llama después, con las filas que quedaron.
+        if old_end > first:
+            self.beginRemoveRows(QModelIndex(), first, old_end - 1)
+        self.replacing = (first, old_end, new_end)
+
+    def end_replace(self, count):
+        # Las vistas ven primero la tabla sin las filas viejas y después con
+        # las nuevas; entre los dos pasos data() salta las filas nuevas
+        first, old_end, new_end = self.replacing
+        self.replacing = None
+        self.gap = (first, new_end - first)
+        self.count = count - (new_end - first)
+        if old_end > first:
+            self.endRemoveRows()
+        if new_end > first:
+            self.beginInsertRows(QModelIndex(), first, new_end - 1)
+        self.gap = None
+        self.count = count
+        if new_end > first:
+            self.endInsertRows()
+
+    def source_row(self, index):
+        # Fila de los datos que corresponde a index
+        i = index.row()
+        gap = self.gap
+        if gap is not None and i >= gap[0]:
+            i += gap[1]
+        return i
+
+    def changed(self, first, end, column=0):
+        self.dataChanged.emit(self.index(first, column), self.index(end - 1, len(self.headers) - 1))
+
+class TokenTableModel(TableModel):
+    # Tabla de lexemas sobre el TokenBuffer del lexer incremental; el texto
+    # de cada celda se saca del buffer al pintarla
+    headers = ('Tipo', 'Valor', 'Línea', 'Columna')
+
+    def __init__(self, tokens, parent=None):
+        super().__init__(parent)
+        self.tokens = tokens
+        self.count = len(tokens)
+        self.bold = QFont()
+        self.bold.setBold(True)
+
+    def splicing(self, first, old_last, new_last):
+        # Se pasa a IncrementalLexer.update, que la llama antes de cambiar
+        # el buffer
+        self.begin_replace(first, old_last, new_last)
+
+    def update(self, first, last):
+        # El lexer reemplazó los tokens desde first por los que ahora ocupan
+        # [first, last); los que siguen son los mismos, pero su línea y
+        # columna pueden haber cambiado
+        count = len(self.tokens)
+        self.end_replace(count)
+        if last < count:
+            self.changed(last, count, 2)
+
+    def data(self, index, role=Qt.DisplayRole):
+        i = self.source_row(index)
+        tokens = self.tokens
+        if not index.isValid() or i >= len(tokens):
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return tokens.type(i)
+            if column == 1:
+                return tokens.value(i)
+            if column == 2:
+                return tokens.lines[i]
+            return tokens.line_index().column(tokens.offsets[i])
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole and column < 2:
+            return self.bold
+        if role == Qt.ForegroundRole and column == 1:
+            return QColor(196, 33, 63)
+        return None
+
+class SymbolTableModel(TableModel):
+    headers = ('Variable', 'Tipo', 'Valor', 'Número de Registro', 'Líneas')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def update(self, symbols):
+        # Se compara con la tabla anterior y solo se avisa de las filas
+        # entre el prefijo y el sufijo que no cambiaron
+        rows = [(symbol.name, symbol.type, 'none' if symbol.value is None else str(symbol.value), symbol.loc,
+                 ", ".join(map(str, symbol.lineno)))
+                for symbol in symbols]
+        old = self.rows
+        limit = min(len(old), len(rows))
+        first = 0
+        while first < limit and old[first] == rows[first]:
+            first += 1
+        same = 0
+        while same < limit - first and old[-1 - same] == rows[-1 - same]:
+            same += 1
+        self.begin_replace(first, len(old) - same, len(rows) - same)
+        self.rows = rows
+        self.end_replace(len(rows))
+
+    def data(self, index, role=Qt.DisplayRole):
+        i = self.source_row(index)
+        if not index.isValid() or i >= len(self.rows):
+            return None
+        if role == Qt.DisplayRole:
+            return self.rows[i][index.column()]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
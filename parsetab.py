@@ -0,0 +1,102 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AND AND ASSIGN CASE CIN COMENTARIO COMMA COUT DEC DO DOUBLE DOUBLE ELSE END ENTRE EQUALS IDENTIFICADOR IF INC INT INT LBRACE LBRACKET LESSEQUALS LESSTHAN LPARENT MAIN MAS MENOS MOD MOREEQUALS MORETHAN NOT NOTEQUALS OR OR PIPE POR POT RBRACE RBRACKET RPARENT SEMICOLON SHAFT STRING SWITCH THEN UNDERSCORE UNTIL WHILEprograma : MAIN LBRACE lista_declaraciones RBRACElista_declaraciones : lista_declaraciones declaracion\n                        | declaraciondeclaracion : declaracion_variable\n                   | lista_sentencias\n                   | comentariodeclaracion : lista_sentencias errorcomentario : COMENTARIOdeclaracion_variable : tipo identificador SEMICOLONidentificador : identificador COMMA IDENTIFICADOR\n                  | IDENTIFICADORtipo : INT\n            | DOUBLElista_sentencias : lista_sentencias sentencia \n                      | vaciosentencia : seleccion \n                | iteracion\n                | repeticion\n                | entrada\n                | salida\n                | asignacion\n                | incremento\n                | decremento\n                | declaracion_variablesentencia : error SEMICOLONcuerpo_then : lista_sentencias\n                   | lista_sentencias error\n       cuerpo : lista_sentencias\n              | lista_sentencias error\n       cuerpo_do : lista_sentencias\n                 | lista_sentencias errorasignacion : IDENTIFICADOR ASSIGN expresion_finalizadaincremento : IDENTIFICADOR INC SEMICOLONdecremento : IDENTIFICADOR DEC SEMICOLONexpresion_finalizada : expresion SEMICOLON\n                       | SEMICOLONseleccion : IF expresion THEN cuerpo_then END\n                 | IF expresion THEN cuerpo_then ELSE cuerpo ENDiteracion : WHILE expresion DO cuerpo ENDrepeticion : DO cuerpo_do UNTIL expresion SEMICOLONentrada : CIN IDENTIFICADOR SEMICOLONsalida : COUT expresion SEMICOLON\n              | COUT STRING SEMICOLONexpresion : expresion operador_comparacion expresion_comparacion\n                 | expresion_comparacionoperador_comparacion : AND\n                     | ORexpresion_comparacion : expresion_simple operacion_relacional expresion_simple\n                       | expresion_simpleoperacion_relacional : MORETHAN\n                   | LESSTHAN\n                   | MOREEQUALS\n                   | LESSEQUALS\n                   | EQUALS\n                   | NOTEQUALSexpresion_simple : expresion_simple primer_operador term\n                         | termprimer_operador : MAS\n                | MENOSterm : term segundo_operador factor\n            | factorsegundo_operador : POR\n              | ENTRE\n              | MODfactor : factor tercer_operador componente\n              | componentetercer_operador : POTcomponente : LPARENT expresion RPARENT\n                 | INT\n                 | DOUBLE\n                 | IDENTIFICADORvacio :'
+    
+_lr_action_items = {'MAIN':([0,],[2,]),'$end':([1,14,],[0,-1,]),'LBRACE':([2,],[3,]),'COMENTARIO':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,35,55,81,82,84,85,86,87,88,101,102,105,107,109,],[11,11,-3,-4,-5,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-9,-41,-32,-36,-33,-34,-42,-43,-35,-37,-39,-40,-38,]),'INT':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,32,35,42,48,50,55,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,78,79,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[12,12,-3,-4,12,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,43,43,-72,43,-25,43,12,43,-9,-72,43,-46,-47,43,43,-50,-51,-52,-53,-54,-55,-58,-59,43,-62,-63,-64,43,-67,-72,43,-41,-32,-36,-33,-34,-42,-43,12,12,-35,-37,-72,-39,-40,-38,]),'DOUBLE':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,32,35,42,48,50,55,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,78,79,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[13,13,-3,-4,13,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,44,44,-72,44,-25,44,13,44,-9,-72,44,-46,-47,44,44,-50,-51,-52,-53,-54,-55,-58,-59,44,-62,-63,-64,44,-67,-72,44,-41,-32,-36,-33,-34,-42,-43,13,13,-35,-37,-72,-39,-40,-38,]),'error':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,48,55,57,78,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,16,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,80,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,104,106,-35,-37,-72,-39,-40,-38,]),'IF':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,48,55,57,78,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,27,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,27,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,27,27,-35,-37,-72,-39,-40,-38,]),'WHILE':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,48,55,57,78,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,28,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,28,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,28,28,-35,-37,-72,-39,-40,-38,]),'DO':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,37,38,39,40,41,43,44,45,46,48,55,57,78,81,82,84,85,86,87,88,91,92,93,94,95,96,97,99,101,102,103,105,107,109,],[-72,-72,-3,-4,29,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,-45,-49,-57,-61,-66,-69,-70,-71,78,29,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,29,-44,-48,-56,-60,-65,-68,29,-35,-37,-72,-39,-40,-38,]),'CIN':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,48,55,57,78,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,30,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,30,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,30,30,-35,-37,-72,-39,-40,-38,]),'COUT':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,29,35,48,55,57,78,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,32,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,32,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,32,32,-35,-37,-72,-39,-40,-38,]),'IDENTIFICADOR':([3,4,5,6,7,8,9,10,11,12,13,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,32,35,42,48,50,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,78,79,81,82,84,85,86,87,88,91,99,101,102,103,105,107,109,],[-72,-72,-3,-4,31,-6,34,-15,-8,-12,-13,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,45,45,-72,49,45,-25,45,31,45,-9,89,-72,45,-46,-47,45,45,-50,-51,-52,-53,-54,-55,-58,-59,45,-62,-63,-64,45,-67,-72,45,-41,-32,-36,-33,-34,-42,-43,31,31,-35,-37,-72,-39,-40,-38,]),'RBRACE':([3,4,5,6,7,8,10,11,15,16,17,18,19,20,21,22,23,24,25,26,35,55,81,82,84,85,86,87,88,101,102,105,107,109,],[-72,14,-3,-4,-5,-6,-15,-8,-2,-7,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-9,-41,-32,-36,-33,-34,-42,-43,-35,-37,-39,-40,-38,]),'UNTIL':([10,17,18,19,20,21,22,23,24,25,26,29,35,47,48,55,80,81,82,84,85,86,87,88,101,102,105,107,109,],[-15,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-72,-25,79,-30,-9,-31,-41,-32,-36,-33,-34,-42,-43,-35,-37,-39,-40,-38,]),'END':([10,17,18,19,20,21,22,23,24,25,26,35,55,57,78,81,82,84,85,86,87,88,90,91,98,99,101,102,103,104,105,106,107,108,109,],[-15,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-9,-72,-72,-41,-32,-36,-33,-34,-42,-43,102,-26,105,-28,-35,-37,-72,-27,-39,-29,-40,109,-38,]),'ELSE':([10,17,18,19,20,21,22,23,24,25,26,35,55,57,81,82,84,85,86,87,88,90,91,101,102,104,105,107,109,],[-15,-14,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-9,-72,-41,-32,-36,-33,-34,-42,-43,103,-26,-35,-37,-27,-39,-40,-38,]),'SEMICOLON':([16,33,34,37,38,39,40,41,43,44,45,49,50,51,52,53,54,80,83,89,92,93,94,95,96,97,100,104,106,],[35,55,-11,-45,-49,-57,-61,-66,-69,-70,-71,81,84,85,86,87,88,35,101,-10,-44,-48,-56,-60,-65,-68,107,35,35,]),'LPARENT':([27,28,32,42,50,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,79,],[42,42,42,42,42,42,-46,-47,42,42,-50,-51,-52,-53,-54,-55,-58,-59,42,-62,-63,-64,42,-67,42,]),'ASSIGN':([31,],[50,]),'INC':([31,],[51,]),'DEC':([31,],[52,]),'STRING':([32,],[54,]),'COMMA':([33,34,89,],[56,-11,-10,]),'THEN':([36,37,38,39,40,41,43,44,45,92,93,94,95,96,97,],[57,-45,-49,-57,-61,-66,-69,-70,-71,-44,-48,-56,-60,-65,-68,]),'AND':([36,37,38,39,40,41,43,44,45,46,53,77,83,92,93,94,95,96,97,100,],[59,-45,-49,-57,-61,-66,-69,-70,-71,59,59,59,59,-44,-48,-56,-60,-65,-68,59,]),'OR':([36,37,38,39,40,41,43,44,45,46,53,77,83,92,93,94,95,96,97,100,],[60,-45,-49,-57,-61,-66,-69,-70,-71,60,60,60,60,-44,-48,-56,-60,-65,-68,60,]),'RPARENT':([37,38,39,40,41,43,44,45,77,92,93,94,95,96,97,],[-45,-49,-57,-61,-66,-69,-70,-71,97,-44,-48,-56,-60,-65,-68,]),'MORETHAN':([38,39,40,41,43,44,45,94,95,96,97,],[63,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'LESSTHAN':([38,39,40,41,43,44,45,94,95,96,97,],[64,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'MOREEQUALS':([38,39,40,41,43,44,45,94,95,96,97,],[65,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'LESSEQUALS':([38,39,40,41,43,44,45,94,95,96,97,],[66,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'EQUALS':([38,39,40,41,43,44,45,94,95,96,97,],[67,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'NOTEQUALS':([38,39,40,41,43,44,45,94,95,96,97,],[68,-57,-61,-66,-69,-70,-71,-56,-60,-65,-68,]),'MAS':([38,39,40,41,43,44,45,93,94,95,96,97,],[69,-57,-61,-66,-69,-70,-71,69,-56,-60,-65,-68,]),'MENOS':([38,39,40,41,43,44,45,93,94,95,96,97,],[70,-57,-61,-66,-69,-70,-71,70,-56,-60,-65,-68,]),'POR':([39,40,41,43,44,45,94,95,96,97,],[72,-61,-66,-69,-70,-71,72,-60,-65,-68,]),'ENTRE':([39,40,41,43,44,45,94,95,96,97,],[73,-61,-66,-69,-70,-71,73,-60,-65,-68,]),'MOD':([39,40,41,43,44,45,94,95,96,97,],[74,-61,-66,-69,-70,-71,74,-60,-65,-68,]),'POT':([40,41,43,44,45,95,96,97,],[76,-66,-69,-70,-71,76,-65,-68,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'programa':([0,],[1,]),'lista_declaraciones':([3,],[4,]),'declaracion':([3,4,],[5,15,]),'declaracion_variable':([3,4,7,48,91,99,],[6,6,26,26,26,26,]),'lista_sentencias':([3,4,29,57,78,103,],[7,7,48,91,99,99,]),'comentario':([3,4,],[8,8,]),'tipo':([3,4,7,48,91,99,],[9,9,9,9,9,9,]),'vacio':([3,4,29,57,78,103,],[10,10,10,10,10,10,]),'sentencia':([7,48,91,99,],[17,17,17,17,]),'seleccion':([7,48,91,99,],[18,18,18,18,]),'iteracion':([7,48,91,99,],[19,19,19,19,]),'repeticion':([7,48,91,99,],[20,20,20,20,]),'entrada':([7,48,91,99,],[21,21,21,21,]),'salida':([7,48,91,99,],[22,22,22,22,]),'asignacion':([7,48,91,99,],[23,23,23,23,]),'incremento':([7,48,91,99,],[24,24,24,24,]),'decremento':([7,48,91,99,],[25,25,25,25,]),'identificador':([9,],[33,]),'expresion':([27,28,32,42,50,79,],[36,46,53,77,83,100,]),'expresion_comparacion':([27,28,32,42,50,58,79,],[37,37,37,37,37,92,37,]),'expresion_simple':([27,28,32,42,50,58,61,79,],[38,38,38,38,38,38,93,38,]),'term':([27,28,32,42,50,58,61,62,79,],[39,39,39,39,39,39,39,94,39,]),'factor':([27,28,32,42,50,58,61,62,71,79,],[40,40,40,40,40,40,40,40,95,40,]),'componente':([27,28,32,42,50,58,61,62,71,75,79,],[41,41,41,41,41,41,41,41,41,96,41,]),'cuerpo_do':([29,],[47,]),'operador_comparacion':([36,46,53,77,83,100,],[58,58,58,58,58,58,]),'operacion_relacional':([38,],[61,]),'primer_operador':([38,93,],[62,62,]),'segundo_operador':([39,94,],[71,71,]),'tercer_operador':([40,95,],[75,75,]),'expresion_finalizada':([50,],[82,]),'cuerpo_then':([57,],[90,]),'cuerpo':([78,103,],[98,108,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> programa","S'",1,None,None,None),
+  ('programa -> MAIN LBRACE lista_declaraciones RBRACE','programa',4,'p_programa','sint.py',30),
+  ('lista_declaraciones -> lista_declaraciones declaracion','lista_declaraciones',2,'p_lista_declaraciones','sint.py',34),
+  ('lista_declaraciones -> declaracion','lista_declaraciones',1,'p_lista_declaraciones','sint.py',35),
+  ('declaracion -> declaracion_variable','declaracion',1,'p_declaracion','sint.py',45),
+  ('declaracion -> lista_sentencias','declaracion',1,'p_declaracion','sint.py',46),
+  ('declaracion -> comentario','declaracion',1,'p_declaracion','sint.py',47),
+  ('declaracion -> lista_sentencias error','declaracion',2,'p_declaracion_error','sint.py',51),
+  ('comentario -> COMENTARIO','comentario',1,'p_comentario','sint.py',58),
+  ('declaracion_variable -> tipo identificador SEMICOLON','declaracion_variable',3,'p_declaracion_variable','sint.py',62),
+  ('identificador -> identificador COMMA IDENTIFICADOR','identificador',3,'p_identificador','sint.py',66),
+  ('identificador -> IDENTIFICADOR','identificador',1,'p_identificador','sint.py',67),
+  ('tipo -> INT','tipo',1,'p_tipo','sint.py',75),
+  ('tipo -> DOUBLE','tipo',1,'p_tipo','sint.py',76),
+  ('lista_sentencias -> lista_sentencias sentencia','lista_sentencias',2,'p_lista_sentencias','sint.py',80),
+  ('lista_sentencias -> vacio','lista_sentencias',1,'p_lista_sentencias','sint.py',81),
+  ('sentencia -> seleccion','sentencia',1,'p_sentencia','sint.py',89),
+  ('sentencia -> iteracion','sentencia',1,'p_sentencia','sint.py',90),
+  ('sentencia -> repeticion','sentencia',1,'p_sentencia','sint.py',91),
+  ('sentencia -> entrada','sentencia',1,'p_sentencia','sint.py',92),
+  ('sentencia -> salida','sentencia',1,'p_sentencia','sint.py',93),
+  ('sentencia -> asignacion','sentencia',1,'p_sentencia','sint.py',94),
+  ('sentencia -> incremento','sentencia',1,'p_sentencia','sint.py',95),
+  ('sentencia -> decremento','sentencia',1,'p_sentencia','sint.py',96),
+  ('sentencia -> declaracion_variable','sentencia',1,'p_sentencia','sint.py',97),
+  ('sentencia -> error SEMICOLON','sentencia',2,'p_sentencia_error','sint.py',101),
+  ('cuerpo_then -> lista_sentencias','cuerpo_then',1,'p_cuerpo','sint.py',106),
+  ('cuerpo_then -> lista_sentencias error','cuerpo_then',2,'p_cuerpo','sint.py',107),
+  ('cuerpo -> lista_sentencias','cuerpo',1,'p_cuerpo','sint.py',108),
+  ('cuerpo -> lista_sentencias error','cuerpo',2,'p_cuerpo','sint.py',109),
+  ('cuerpo_do -> lista_sentencias','cuerpo_do',1,'p_cuerpo','sint.py',110),
+  ('cuerpo_do -> lista_sentencias error','cuerpo_do',2,'p_cuerpo','sint.py',111),
+  ('asignacion -> IDENTIFICADOR ASSIGN expresion_finalizada','asignacion',3,'p_asignacion','sint.py',121),
+  ('incremento -> IDENTIFICADOR INC SEMICOLON','incremento',3,'p_incremento','sint.py',125),
+  ('decremento -> IDENTIFICADOR DEC SEMICOLON','decremento',3,'p_decremento','sint.py',129),
+  ('expresion_finalizada -> expresion SEMICOLON','expresion_finalizada',2,'p_expresion_finalizada','sint.py',133),
+  ('expresion_finalizada -> SEMICOLON','expresion_finalizada',1,'p_expresion_finalizada','sint.py',134),
+  ('seleccion -> IF expresion THEN cuerpo_then END','seleccion',5,'p_seleccion','sint.py',141),
+  ('seleccion -> IF expresion THEN cuerpo_then ELSE cuerpo END','seleccion',7,'p_seleccion','sint.py',142),
+  ('iteracion -> WHILE expresion DO cuerpo END','iteracion',5,'p_iteracion','sint.py',149),
+  ('repeticion -> DO cuerpo_do UNTIL expresion SEMICOLON','repeticion',5,'p_repeticion','sint.py',153),
+  ('entrada -> CIN IDENTIFICADOR SEMICOLON','entrada',3,'p_entrada','sint.py',157),
+  ('salida -> COUT expresion SEMICOLON','salida',3,'p_salida','sint.py',161),
+  ('salida -> COUT STRING SEMICOLON','salida',3,'p_salida','sint.py',162),
+  ('expresion -> expresion operador_comparacion expresion_comparacion','expresion',3,'p_expresion','sint.py',167),
+  ('expresion -> expresion_comparacion','expresion',1,'p_expresion','sint.py',168),
+  ('operador_comparacion -> AND','operador_comparacion',1,'p_operador_comparacion','sint.py',175),
+  ('operador_comparacion -> OR','operador_comparacion',1,'p_operador_comparacion','sint.py',176),
+  ('expresion_comparacion -> expresion_simple operacion_relacional expresion_simple','expresion_comparacion',3,'p_expresion_comparacion','sint.py',180),
+  ('expresion_comparacion -> expresion_simple','expresion_comparacion',1,'p_expresion_comparacion','sint.py',181),
+  ('operacion_relacional -> MORETHAN','operacion_relacional',1,'p_operacion_relacional','sint.py',188),
+  ('operacion_relacional -> LESSTHAN','operacion_relacional',1,'p_operacion_relacional','sint.py',189),
+  ('operacion_relacional -> MOREEQUALS','operacion_relacional',1,'p_operacion_relacional','sint.py',190),
+  ('operacion_relacional -> LESSEQUALS','operacion_relacional',1,'p_operacion_relacional','sint.py',191),
+  ('operacion_relacional -> EQUALS','operacion_relacional',1,'p_operacion_relacional','sint.py',192),
+  ('operacion_relacional -> NOTEQUALS','operacion_relacional',1,'p_operacion_relacional','sint.py',193),
+  ('expresion_simple -> expresion_simple primer_operador term','expresion_simple',3,'p_expresion_simple','sint.py',197),
+  ('expresion_simple -> term','expresion_simple',1,'p_expresion_simple','sint.py',198),
+  ('primer_operador -> MAS','primer_operador',1,'p_primer_operador','sint.py',205),
+  ('primer_operador -> MENOS','primer_operador',1,'p_primer_operador','sint.py',206),
+  ('term -> term segundo_operador factor','term',3,'p_term','sint.py',210),
+  ('term -> factor','term',1,'p_term','sint.py',211),
+  ('segundo_operador -> POR','segundo_operador',1,'p_segundo_operador','sint.py',218),
+  ('segundo_operador -> ENTRE','segundo_operador',1,'p_segundo_operador','sint.py',219),
+  ('segundo_operador -> MOD','segundo_operador',1,'p_segundo_operador','sint.py',220),
+  ('factor -> factor tercer_operador componente','factor',3,'p_factor','sint.py',224),
+  ('factor -> componente','factor',1,'p_factor','sint.py',225),
+  ('tercer_operador -> POT','tercer_operador',1,'p_tercer_operador','sint.py',232),
+  ('componente -> LPARENT expresion RPARENT','componente',3,'p_componente','sint.py',236),
+  ('componente -> INT','componente',1,'p_componente','sint.py',237),
+  ('componente -> DOUBLE','componente',1,'p_componente','sint.py',238),
+  ('componente -> IDENTIFICADOR','componente',1,'p_componente','sint.py',239),
+  ('vacio -> <empty>','vacio',0,'p_vacio','sint.py',246),
+]
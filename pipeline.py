@@ -0,0 +1,77 @@
+from lexer import tokenize, identifier_index
+from sint import IncrementalParser
+from sem import SemanticAnalyzer
+from codigo import CodeGenerator
+
+class CompilationPipeline:
+    # Léxico → sintáctico → semántico → código P sobre una versión del texto.
+    # Cada etapa corre una sola vez por versión, cuando se pide su resultado,
+    # y lo guarda para las vistas, la tabla de símbolos y la máquina de pila.
+    # Con share=True el parser comparte las expresiones repetidas.
+    def __init__(self, share=False):
+        self.source = None
+        self.version = 0
+        # Conserva los subárboles de las sentencias entre versiones
+        self.parser = IncrementalParser(share=share)
+        self.compiled = {}
+        self.clear()
+
+    def clear(self):
+        self.stages = set()
+        self.tokens = None
+        self.tree = None
+        self.syntax_errors = []
+        self.analyzer = None
+        self.annotated_tree = None
+        self.semantic_errors = []
+        self.code = None
+
+    def update(self, text, tokens=None):
+        # Devuelve False si el texto no cambió y los resultados siguen valiendo
+        if text == self.source:
+            return False
+        self.source = text
+        self.version += 1
+        self.clear()
+        if tokens is not None and tokens.source == text:
+            self.tokens = tokens
+            self.stages.add('lex')
+        return True
+
+    def lex(self):
+        if 'lex' not in self.stages:
+            self.tokens = tokenize(self.source)
+            self.stages.add('lex')
+        return self.tokens
+
+    def parse(self):
+        if 'parse' not in self.stages:
+            self.tree = self.parser.parse(self.lex())
+            self.syntax_errors = self.parser.errors
+            self.stages.add('parse')
+        return self.tree
+
+    def analyze(self):
+        if 'semantic' not in self.stages:
+            tree = self.parse()
+            # Sin árbol sintáctico no hay análisis semántico: annotated_tree
+            # y analyzer quedan en None
+            if tree is not None:
+                # Las expresiones compiladas de la versión anterior se reusan
+                analyzer = SemanticAnalyzer(self.compiled)
+                analyzer.load_identifier_index(identifier_index(self.lex()))
+                self.annotated_tree = analyzer.analyze(tree)
+                self.analyzer = analyzer
+                self.compiled = analyzer.compiled
+                self.semantic_errors = analyzer.errors
+            self.stages.add('semantic')
+        return self.annotated_tree
+
+    def generate(self):
+        if 'codegen' not in self.stages:
+            tree = self.parse()
+            if not tree:
+                raise ValueError("Árbol sintáctico no generado. Revisa el código fuente.")
+            self.code = CodeGenerator().generate_code(tree, self.parser.share)
+            self.stages.add('codegen')
+        return self.code
@@ -0,0 +1,161 @@
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from codigo import StackMachine
+
+class AnalysisScheduler(QObject):
+    # Junta las ediciones que llegan seguidas y corre callback una sola vez,
+    # cuando pasan delay ms sin cambios. Si las ediciones no paran, corre de
+    # todos modos max_delay ms después de la primera que quedó pendiente.
+    # pending cuenta las ediciones que esperan, last_coalesced las que se
+    # juntaron en la última corrida y coalesced las que se ahorraron en total.
+    def __init__(self, callback, delay=150, max_delay=1000, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.delay = delay
+        self.max_delay = max_delay
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run)
+        self.pending = 0
+        self.first_edit = None
+        self.runs = 0
+        self.last_coalesced = 0
+        self.coalesced = 0
+
+    def schedule(self):
+        now = time.monotonic()
+        if not self.pending:
+            self.first_edit = now
+        self.pending += 1
+        waited = (now - self.first_edit) * 1000
+        self.timer.start(int(max(0, min(self.delay, self.max_delay - waited))))
+
+    def flush(self):
+        # Corre ya lo pendiente; se usa antes de leer resultados del análisis
+        if self.pending:
+            self.timer.stop()
+            self.run()
+
+    def run(self):
+        self.last_coalesced = self.pending
+        self.coalesced += max(self.pending - 1, 0)
+        self.runs += 1
+        self.pending = 0
+        self.first_edit = None
+        self.callback()
+
+class CompilationCancelled(Exception):
+    pass
+
+class CompilationJob:
+    # Una compilación de una versión del texto. El hilo de trabajo llena los
+    # resultados; generation dice a qué pedido pertenece y cancel la detiene.
+    def __init__(self, generation, text, tokens):
+        self.generation = generation
+        self.text = text
+        self.tokens = tokens
+        self.cancel = threading.Event()
+        self.answers = queue.Queue()
+        self.tree = None
+        self.syntax_errors = []
+        self.annotated_tree = None
+        self.analyzer = None
+        self.code = None
+        self.machine = None
+        self.error = None
+
+    def check(self):
+        if self.cancel.is_set():
+            raise CompilationCancelled()
+
+class CompilationRunner(QObject):
+    # Corre el pipeline y la máquina de pila en un hilo aparte, un trabajo a
+    # la vez. Cada submit o cancel sube generation; finished solo se emite
+    # para el trabajo de la generación actual y los demás se descartan.
+    # El pipeline solo se usa desde el hilo de trabajo.
+    finished = pyqtSignal(object)
+    input_requested = pyqtSignal(object, str)
+
+    def __init__(self, pipeline, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.job = None
+        self.dropped = 0
+
+    def submit(self, text, tokens=None):
+        self.cancel()
+        job = self.job = CompilationJob(self.generation, text, tokens)
+        self.executor.submit(self.run, job)
+        return job
+
+    def cancel(self):
+        # Lo que esté corriendo se detiene y su resultado ya no se muestra
+        self.generation += 1
+        if self.job is not None:
+            self.job.cancel.set()
+            self.job = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    def current(self, job):
+        return job.generation == self.generation and not job.cancel.is_set()
+
+    def run(self, job):
+        pipeline = self.pipeline
+        try:
+            job.check()
+            pipeline.update(job.text, job.tokens)
+            job.tree = pipeline.parse()
+            job.syntax_errors = pipeline.syntax_errors
+            job.check()
+            job.annotated_tree = pipeline.analyze()
+            job.analyzer = pipeline.analyzer
+            job.check()
+            try:
+                job.code = pipeline.generate()
+                job.machine = StackMachine()
+                job.machine.cancelled = job.cancel
+                job.machine.input_callback = lambda var_name: self.ask(job, var_name)
+                job.machine.execute(job.code)
+            except Exception as e:
+                job.error = e
+            job.check()
+        except CompilationCancelled:
+            pass
+        except Exception as e:
+            # En el hilo de trabajo nadie más vería el error; lo que alcanzó
+            # a calcularse, como los errores de sintaxis, se muestra igual
+            traceback.print_exc()
+            job.error = e
+        if self.current(job):
+            self.finished.emit(job)
+        else:
+            self.dropped += 1
+
+    def ask(self, job, var_name):
+        # Se llama desde el hilo de trabajo: la ventana pide el valor y lo
+        # devuelve con answer; mientras tanto se revisa si se canceló
+        self.input_requested.emit(job, var_name)
+        while True:
+            if job.cancel.is_set():
+                raise ValueError("Ejecución cancelada.")
+            try:
+                value = job.answers.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if value is None:
+                raise ValueError(f"Se canceló la entrada para la variable '{var_name}'")
+            return value
+
+    def answer(self, job, value):
+        job.answers.put(value)
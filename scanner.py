@@ -0,0 +1,208 @@
+import re
+import ply.lex as lex
+
+from lexer import reserved, UNTERMINATED_COMMENT
+
+# Analizador léxico escrito a mano que produce los mismos tokens que el lexer
+# de PLY en una sola pasada: el primer carácter elige la regla en una tabla y
+# los números se leen completos sin pasar por los estados double y deletedot.
+
+_IDENT_TAIL = re.compile(r'[a-zA-Z_0-9]*')
+_DIGITS = re.compile(r'\d*')
+
+_DOUBLE_OPERATORS = {
+    '++': 'INC',
+    '--': 'DEC',
+    '>=': 'MOREEQUALS',
+    '<=': 'LESSEQUALS',
+    '==': 'EQUALS',
+    '!=': 'NOTEQUALS',
+}
+
+_SINGLE_OPERATORS = {
+    ',': 'COMMA',
+    '!': 'NOT',
+    '(': 'LPARENT',
+    ')': 'RPARENT',
+    '{': 'LBRACE',
+    '}': 'RBRACE',
+    '[': 'LBRACKET',
+    ']': 'RBRACKET',
+    '|': 'PIPE',
+    '+': 'MAS',
+    '-': 'MENOS',
+    '/': 'ENTRE',
+    '*': 'POR',
+    '%': 'MOD',
+    '^': 'POT',
+    '=': 'ASSIGN',
+    '>': 'MORETHAN',
+    '<': 'LESSTHAN',
+    ';': 'SEMICOLON',
+}
+
+class Scanner:
+    def __init__(self):
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        self.state = 'INITIAL'
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.lexlen = len(data)
+
+    def begin(self, state):
+        # Entre tokens el lexer de PLY solo puede quedar en INITIAL o en
+        # deletedot (después de un error en un número con punto)
+        self.state = state
+
+    def current_state(self):
+        return self.state
+
+    def clone(self):
+        c = Scanner()
+        c.lineno = self.lineno
+        return c
+
+    def token(self):
+        tok = self.next()
+        if tok is None:
+            return None
+        t = lex.LexToken()
+        t.type, t.value, t.lineno, t.lexpos = tok
+        t.lexer = self
+        return t
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def next(self):
+        data = self.lexdata
+        n = self.lexlen
+        pos = self.lexpos
+        if self.state == 'deletedot':
+            pos += 1
+            self.state = 'INITIAL'
+        while pos < n:
+            c = data[pos]
+            if c == ' ' or c == '\t':
+                pos += 1
+                continue
+            if c == '\n':
+                start = pos
+                while pos < n and data[pos] == '\n':
+                    pos += 1
+                self.lineno += pos - start
+                continue
+            handler = _DISPATCH.get(c)
+            if handler is None:
+                handler = Scanner._number if c.isdecimal() else Scanner._error
+            tok = handler(self, data, pos)
+            if tok is not None:
+                return tok
+            pos = self.lexpos
+        self.lexpos = pos
+        return None
+
+    def _comment(self, data, pos):
+        if data.startswith('*', pos + 1):
+            close = data.find('*°', pos + 2)
+            lineno = self.lineno
+            if close < 0:
+                self.lexpos = self.lexlen
+                self.lineno += data.count('\n', pos)
+                message = UNTERMINATED_COMMENT + " in line %d column %d" % (lineno, pos + 1)
+                return ('error', message, lineno, pos)
+            self.lexpos = close + 2
+            self.lineno += data.count('\n', pos, close)
+            return ('COMENTARIO', data[pos:close + 2], lineno, pos)
+        end = data.find('\n', pos)
+        if end < 0:
+            end = self.lexlen
+        self.lexpos = end
+        return ('COMENTARIO', data[pos:end], self.lineno, pos)
+
+    def _identifier(self, data, pos):
+        end = _IDENT_TAIL.match(data, pos + 1).end()
+        value = data[pos:end]
+        self.lexpos = end
+        return (reserved.get(value, 'IDENTIFICADOR'), value, self.lineno, pos)
+
+    def _after_digit(self, data, pos):
+        # t_INT y t_double convierten el número en MENOS si va pegado a una
+        # letra o un dígito (lexdata[-1] incluido, como en lexer.py)
+        prev = data[pos - 1]
+        if prev.isdigit() or prev.isalpha():
+            self.lexpos = pos + 1
+            return ('MENOS', data[pos], self.lineno, pos)
+        return None
+
+    def _number(self, data, pos):
+        end = _DIGITS.match(data, pos).end()
+        if data.startswith('.', end):
+            tok = self._after_digit(data, pos)
+            if tok is not None:
+                return tok
+            dot = end + 1
+            end = _DIGITS.match(data, dot).end()
+            if end > dot:
+                self.lexpos = end
+                return ('DOUBLE', data[pos:end], self.lineno, pos)
+            if dot >= self.lexlen:
+                self.lexpos = dot
+                return None
+            self.lexpos = dot
+            message = "Ilegal character at '%s' in line %d column %d" % (data[dot], self.lineno, dot)
+            return ('error', message, self.lineno, dot)
+        tok = self._after_digit(data, pos)
+        if tok is not None:
+            return tok
+        self.lexpos = end
+        return ('INT', data[pos:end], self.lineno, pos)
+
+    def _minus(self, data, pos):
+        if pos + 1 < self.lexlen and data[pos + 1].isdecimal():
+            end = _DIGITS.match(data, pos + 1).end()
+            tok = self._after_digit(data, pos)
+            if tok is not None:
+                return tok
+            self.lexpos = end
+            return ('INT', data[pos:end], self.lineno, pos)
+        return self._operator(data, pos)
+
+    def _string(self, data, pos):
+        close = data.find('"', pos + 1)
+        if close < 0:
+            return self._error(data, pos)
+        self.lexpos = close + 1
+        lineno = self.lineno
+        self.lineno += data.count('\n', pos, close)
+        return ('STRING', data[pos:close + 1], lineno, pos)
+
+    def _operator(self, data, pos):
+        pair = data[pos:pos + 2]
+        kind = _DOUBLE_OPERATORS.get(pair)
+        if kind is not None:
+            self.lexpos = pos + 2
+            return (kind, pair, self.lineno, pos)
+        self.lexpos = pos + 1
+        return (_SINGLE_OPERATORS[data[pos]], data[pos], self.lineno, pos)
+
+    def _error(self, data, pos):
+        self.lexpos = pos + 1
+        message = "Ilegal character at '%s' in line %d column %d" % (data[pos], self.lineno, pos + 2)
+        return ('error', message, self.lineno, pos)
+
+_DISPATCH = {}
+for _c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_':
+    _DISPATCH[_c] = Scanner._identifier
+for _c in '0123456789':
+    _DISPATCH[_c] = Scanner._number
+for _c in _SINGLE_OPERATORS:
+    _DISPATCH[_c] = Scanner._operator
+_DISPATCH['-'] = Scanner._minus
+_DISPATCH['°'] = Scanner._comment
+_DISPATCH['"'] = Scanner._string
@@ -1,108 +1,430 @@
-from PyQt5.QtGui import QStandardItem
-import math, re
+import functools, math, operator, re
+from types import GeneratorType
 
-symbol_table = {}
-temp_sym_table = {}
+from arbol import Node, Visitor, Assign, Relation, Logical, BIN_OP, to_text, IF, IF_ELSE, DO_UNTIL, WHILE, COUT
 
-class SemanticAnalyzer:
+# Largo máximo del texto de una fila del árbol anotado
+ANNOTATION_TEXT_LIMIT = 500
+
+# Constantes que se toman como double
+FLOAT_LITERAL = re.compile(r'-?\d+.\d+')
+# Lo que el lexer reconoce como número (INT o DOUBLE); lo demás es un nombre
+NUMBER_LITERAL = re.compile(r'-?\d')
+
+def literal_value(text):
+    value = float(text)
+    if value % 1 == 0 and not FLOAT_LITERAL.match(text):
+        return int(value)
+    return value
+
+def stored_value(symbol):
+    # Valor de una variable con el tipo con el que se declaró
+    value = float(symbol.value)
+    if value % 1 == 0 and symbol.type != 'double':
+        return int(value)
+    return value
+
+def _is_float(a, b):
+    return isinstance(a, float) or isinstance(b, float)
+
+def _add_int(a, b):
+    result = math.trunc(a + b)
+    return float(result) if _is_float(a, b) else result
+
+def _sub_int(a, b):
+    result = math.trunc(a - b)
+    return float(result) if _is_float(a, b) else result
+
+def _div(a, b):
+    if isinstance(a, int):
+        result = math.trunc(a / b)
+        return float(result) if isinstance(b, float) else result
+    return a / b
+
+def _div_int(a, b):
+    result = math.trunc(a / b)
+    return float(result) if _is_float(a, b) else result
+
+# Operaciones aritméticas según el tipo de la variable que recibe el
+# resultado: (double, int)
+ARITHMETIC = {
+    '+': (operator.add, _add_int),
+    '-': (operator.sub, _sub_int),
+    '*': (operator.mul, lambda a, b: math.trunc(a * b)),
+    '/': (_div, _div_int),
+    '%': (operator.mod, lambda a, b: math.trunc(a % b)),
+}
+
+def result_type(op, var_type, a, b):
+    if op in '*%':
+        return var_type
+    if _is_float(a, b):
+        return 'double'
+    return 'int' if op == '/' else var_type
+
+RELATIONS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+class Annotation:
+    # Atributo 'tipo=...' o 'valor=...' del árbol anotado. Guarda el tipo o
+    # el valor sin formatear; el texto se arma solo cuando una vista muestra
+    # la fila o el nodo que lo contiene.
+    __slots__ = ('label', 'value')
+
+    def __init__(self, label, value):
+        self.label = label
+        self.value = value
+
+    def __str__(self):
+        return f'{self.label}={self.value}'
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, Annotation):
+            return NotImplemented
+        return (self.label == other.label and type(self.value) is type(other.value)
+                and self.value == other.value)
+
+    def __hash__(self):
+        return hash((self.label, self.value))
+
+# Etiquetas del valor de cada operación aritmética y de las relaciones
+VALUE_LABELS = {op: op + ' valor' for op in ARITHMETIC}
+RELATION_VALUE = Relation.label + ' valor'
+RELATION_BODY_VALUE = Relation.label + 'valor'
+
+def _same(a, b):
+    # 1 y 1.0 se muestran distinto
+    return type(a) is type(b) and a == b
+
+def term_row(term):
+    # Fila de una constante o variable dentro de una expresión anotada
+    if isinstance(term, Annotated):
+        return term
+    return (term, 'type=double' if isinstance(term, float) else 'type=int')
+
+def annotation_row(value):
+    # Para to_text: los nodos anotados se muestran como su fila
+    return value.row() if isinstance(value, Annotated) else None
+
+class Annotated:
+    # Nodo del árbol anotado. Guarda tipos, valores y anotaciones hijas sin
+    # formatear; row() arma la tupla con la que lo muestran las vistas.
+    __slots__ = ()
+
+    def row(self):
+        raise NotImplementedError
+
+    def __getitem__(self, index):
+        return self.row()[index]
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(_same(getattr(self, name), getattr(other, name)) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return to_text(self, expand=annotation_row)
+
+class DeclarationAnnotation(Annotated):
+    __slots__ = ('type', 'names')
+
+    def __init__(self, type, names):
+        self.type = type
+        self.names = names
+
+    def row(self):
+        default_value = 0 if self.type == 'int' else 0.0
+        return (self.type, [(var, Annotation('tipo', self.type), Annotation('valor', default_value)) for var in self.names])
+
+class ExpressionAnnotation(Annotated):
+    # Operación aritmética; left y right son otra ExpressionAnnotation o el
+    # valor de una constante o variable
+    __slots__ = ('op', 'value', 'type', 'left', 'right')
+
+    def __init__(self, op, value, type, left, right):
+        self.op = op
+        self.value = value
+        self.type = type
+        self.left = left
+        self.right = right
+
+    def row(self):
+        return (Annotation(VALUE_LABELS[self.op], self.value), self.value,
+                term_row(self.left), term_row(self.right), Annotation('tipo', self.type))
+
+    def operands(self):
+        # Fila sin valor ni tipo, como aparece dentro de una asignación
+        return (Annotation(VALUE_LABELS[self.op], self.value), term_row(self.left), term_row(self.right))
+
+class AssignmentAnnotation(Annotated):
+    # value es None si la asignación es errónea; expr es None si el valor
+    # asignado no es una operación
+    __slots__ = ('name', 'type', 'value', 'expr')
+
+    def __init__(self, name, type, value, expr=None):
+        self.name = name
+        self.type = type
+        self.value = value
+        self.expr = expr
+
+    def row(self):
+        if self.value is None:
+            return (Assign.label, self.name, [Annotation('tipo', self.type), 'valor=Error'])
+        attributes = [Annotation('tipo', self.type), Annotation('valor', self.value)]
+        if self.expr is not None:
+            attributes.append(self.expr.operands())
+        return (Assign.label, self.name, attributes)
+
+class RelationAnnotation(Annotated):
+    # body es la anotación del cuerpo de un if, o None en las demás condiciones
+    __slots__ = ('op', 'left', 'right', 'value', 'body')
+
+    def __init__(self, op, left, right, value, body=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.value = value
+        self.body = body
+
+    def row(self):
+        if self.body is None:
+            return (Annotation(RELATION_VALUE, self.value), self.value, (self.op, self.left, self.right))
+        return (Annotation(RELATION_BODY_VALUE, self.value), self.value, (self.op, self.left, self.right, self.body))
+
+class LogicalAnnotation(Annotated):
+    __slots__ = ('op', 'value', 'left', 'right')
+
+    def __init__(self, op, value, left, right):
+        self.op = op
+        self.value = value
+        self.left = left
+        self.right = right
+
+    def row(self):
+        return (Logical.label, self.op, Annotation('\n valor', self.value), self.left, self.right)
+
+def _undefined(analyzer):
+    analyzer.errors.append("Error: expresión no válida (valor es None).")
+
+@functools.lru_cache(maxsize=4096)
+def compile_term(term):
+    # Función que evalúa una constante o una variable
+    if term is None:
+        return _undefined
+    if NUMBER_LITERAL.match(term):
+        try:
+            value = literal_value(term)
+        except ValueError:
+            value = None
+        if value is not None:
+            return lambda analyzer: value
+    def evaluate(analyzer):
+        symbol = analyzer.symbols.visible.get(term)
+        if symbol is None:
+            analyzer.errors.append(f"Error: '{term}' aún no se ha declarado.")
+            return None
+        if symbol.value is None:
+            analyzer.errors.append(f"Error: la variable '{term}' no tiene un valor asignado.")
+            return None
+        return stored_value(symbol)
+    return evaluate
+
+class Symbol:
+    __slots__ = ('name', 'type', 'value', 'loc', 'lineno')
+
+    def __init__(self, name, type, value, loc, lineno):
+        self.name = name
+        self.type = type
+        self.value = value
+        self.loc = loc
+        self.lineno = lineno
+
+class SymbolTable:
+    # Tabla de símbolos de un análisis. visible tiene el símbolo al que se
+    # refiere cada nombre en el punto actual del recorrido, así que buscar es
+    # un acceso al diccionario. Cada bloque anota lo que declaró y al cerrarse
+    # lo quita. entries guarda todos los símbolos en orden de declaración.
     def __init__(self):
+        self.visible = {}
+        self.scopes = [[]]
+        self.entries = []
+
+    def __contains__(self, name):
+        return name in self.visible
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, term):
+        # Las subexpresiones no son variables y los nodos no se pueden usar como llave
+        if isinstance(term, Node):
+            return None
+        return self.visible.get(term)
+
+    def declare(self, name, type, value, lineno):
+        symbol = Symbol(name, type, value, len(self.entries) + 1, lineno)
+        self.scopes[-1].append((name, self.visible.get(name)))
+        self.visible[name] = symbol
+        self.entries.append(symbol)
+        return symbol
+
+    def enter_scope(self):
+        self.scopes.append([])
+
+    def exit_scope(self):
+        for name, previous in reversed(self.scopes.pop()):
+            if previous is None:
+                del self.visible[name]
+            else:
+                self.visible[name] = previous
+
+class SemanticAnalyzer(Visitor):
+    # Cada análisis tiene su propia tabla de símbolos y su propio índice de
+    # identificadores, así que varios programas se pueden analizar a la vez
+    def __init__(self, compiled=None):
         self.errors = []
+        self.symbols = SymbolTable()
+        self.identifiers = {}
+        # Expresiones compiladas en este análisis y en el anterior
+        self.compiled = {}
+        self.previous = compiled or {}
 
     def analyze(self, syntax_tree):
-        declarations = syntax_tree[1]
+        declarations = syntax_tree.body
         annotated_tree = self.process_program(declarations)
         return ('programa', annotated_tree)
 
     def process_program(self, declarations):
+        # Recorrido con una pila explícita de generadores, sin recursión: los
+        # métodos que necesitan la anotación de un cuerpo o de una condición
+        # la piden con yield y la reciben como resultado del yield
+        stack = [self.process_list(declarations)]
+        result = None
+        while True:
+            try:
+                step = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return stop.value
+                result = stop.value
+                continue
+            if isinstance(step, GeneratorType):
+                stack.append(step)
+                result = None
+            else:
+                result = step
+
+    def process_list(self, declarations):
         annotated_declarations = []
         for declaration in declarations:
-            if isinstance(declaration, tuple) and declaration[0] in ['int', 'double']:
-                annotated_declarations.append(self.process_variable_declaration(declaration))
-            elif declaration[0] == '=':
-                annotated_declarations.append(self.process_assignment(declaration))
-            elif declaration[0] in ['if', 'if-else', 'do-until', 'while']:
-                annotated_declarations.append(self.process_logical_structure(declaration))
-            elif declaration[0] in ['cin', 'cout']:
-                annotated_declarations.append(self.process_input_output(declaration))
+            if isinstance(declaration, Node):
+                process = self.table[declaration.kind]
+                if process is not None:
+                    # Solo las estructuras de control devuelven un generador
+                    annotated = process(self, declaration)
+                    if annotated.__class__ is GeneratorType:
+                        annotated = yield annotated
+                    annotated_declarations.append(annotated)
             elif isinstance(declaration, list):
-                annotated_declarations.append(self.process_program(declaration))
+                annotated_declarations.append((yield self.process_list(declaration)))
         return (annotated_declarations)
 
+    def process_block(self, body):
+        # Las variables declaradas en el cuerpo de un if, while o do solo
+        # existen dentro de ese cuerpo
+        self.symbols.enter_scope()
+        annotated_body = yield self.process_list(body)
+        self.symbols.exit_scope()
+        return annotated_body
+
     def process_variable_declaration(self, declaration):
-        var_type = declaration[0]
-        variables = declaration[1]
-        annotated_vars = []
+        var_type = declaration.type
+        variables = declaration.names
         for var in variables:
-            if var in symbol_table:
+            if var in self.symbols:
                 self.errors.append(f"Error: '{var}' ya se ha declarado")
                 return (var, 'Error')
             else:
                 default_value = 0 if var_type == 'int' else 0.0
-                self.add_to_symbol_table(var, var_type, default_value, temp_sym_table.get(var)["lineno"])
-                annotated_vars.append((var, f'tipo={var_type}', f'valor={default_value}'))
-        return (var_type, annotated_vars)
+                self.add_to_symbol_table(var, var_type, default_value, self.identifiers.get(var)["lineno"])
+        return DeclarationAnnotation(var_type, variables)
 
 
     def process_assignment(self, assignment):
-        var_name = assignment[1]
-        expr = assignment[2]
+        var_name = assignment.name
+        expr = assignment.expr
 
-        if var_name not in symbol_table:
+        symbol = self.symbols.lookup(var_name)
+        if symbol is None:
             self.errors.append(f"Error: '{var_name}' aún no se ha declarado.")
             return (var_name, 'error')
 
-        var_type = symbol_table[var_name]["type"]
-        if not isinstance(expr, tuple):
-            expr_value = self.evaluate_expression(expr, var_type, True)
+        var_type = symbol.type
+        annotation = None
+        if isinstance(expr, Node):
+            annotation = self.annotate_expression(expr, var_type)
+            value = None if annotation is None else annotation.value
         else:
-            expr_value = self.evaluate_expression(expr, var_type, False)
-
-        if isinstance(expr_value, tuple) and len(expr_value) > 2:
-            symbol_table[var_name]["value"] = expr_value[1]
-            value = expr_value[1]
-            if value == None:
-                self.errors.append(f"Error: La asignacion de '{var_name}' es errónea")
-                return (assignment[0], var_name, [f'tipo={var_type}', f'valor=Error', (expr_value[0], expr_value[2], expr_value[3])])
-            return (assignment[0], var_name, [f'tipo={var_type}', f'valor={expr_value[1]}', (expr_value[0], expr_value[2], expr_value[3])])
-        else:
-            if isinstance(expr_value, tuple):
-                symbol_table[var_name]["value"] = expr_value[0]
-            else:
-                symbol_table[var_name]["value"] = expr_value
-            if expr_value == None:
-                self.errors.append(f"Error: La asignacion de '{var_name}' es errónea")
-                return (assignment[0], var_name, [f'tipo={var_type}', f'valor=Error'])
-            return (assignment[0], var_name, [f'tipo={var_type}', f'valor={expr_value[0]}'])
+            value = self.evaluate_expression(expr, var_type, True)
+        symbol.value = value
+        if value is None:
+            self.errors.append(f"Error: La asignacion de '{var_name}' es errónea")
+        return AssignmentAnnotation(var_name, var_type, value, annotation)
         
     def process_logical_structure(self, declaration):
-        if declaration[0] == 'if':
-            return ('if', self.process_logical_relation(declaration, False), self.process_program(declaration[2]))
-        elif declaration[0] == 'if-else':
-            cond = self.process_logical_relation(declaration, False)
-            cuerpo_if = self.process_program(declaration[2])
-            cuerpo_else = self.process_program(declaration[3])
+        if declaration.kind == IF:
+            cond = yield self.process_logical_relation(declaration, False)
+            return ('if', cond, (yield self.process_if_body(declaration, cond)))
+        elif declaration.kind == IF_ELSE:
+            cond = yield self.process_logical_relation(declaration, False)
+            cuerpo_if = yield self.process_if_body(declaration, cond)
+            cuerpo_else = yield self.process_block(declaration.orelse)
             return ('if-else', cond, cuerpo_if, cuerpo_else)
-        elif declaration[0] == 'do-until':
-            return ('do', self.process_program(declaration[1])), ('until', self.process_logical_relation(declaration[2], True))
-        elif declaration[0] == 'while':
-            return ('while', self.process_logical_relation(declaration[1], True)), (self.process_program(declaration[2]))
+        elif declaration.kind == DO_UNTIL:
+            cuerpo = yield self.process_block(declaration.body)
+            return ('do', cuerpo), ('until', (yield self.process_logical_relation(declaration.cond, True)))
+        elif declaration.kind == WHILE:
+            cond = yield self.process_logical_relation(declaration.cond, True)
+            return ('while', cond), (yield self.process_block(declaration.body))
     
+    def process_if_body(self, declaration, cond):
+        # Con una relación simple, process_logical_relation ya analizó el
+        # cuerpo del if junto con la condición; se usa esa misma anotación
+        if isinstance(cond, RelationAnnotation) and cond.body is not None:
+            return cond.body
+        return (yield self.process_block(declaration.body))
+
     def process_logical_relation(self, condition, comp):
         if comp:
             relation = condition
         else:
-            relation = condition[1]
-        if relation[0] == 'relacion':
-            comparator = relation[1]
-            first_term = relation[2][0]
-            second_term = relation[2][1]
-            isNotInTable_1 = symbol_table.get(first_term) is None
-            isNotInTable_2 = symbol_table.get(second_term) is None
+            relation = condition.cond
+        if isinstance(relation, Relation):
+            comparator = relation.op
+            first_term = relation.left
+            second_term = relation.right
+            isNotInTable_1 = self.symbols.lookup(first_term) is None
+            isNotInTable_2 = self.symbols.lookup(second_term) is None
             var_type = None
             if not isNotInTable_1 and isNotInTable_2:
-                var_type = symbol_table.get(first_term)["type"]
+                var_type = self.symbols.lookup(first_term).type
             elif not isNotInTable_2 and isNotInTable_1:
-                var_type = symbol_table.get(second_term)["type"]
+                var_type = self.symbols.lookup(second_term).type
             else:
                 try:
                     int(first_term)
@@ -115,316 +437,201 @@ class SemanticAnalyzer:
                         var_type = 'int'
             relation_value = self.evaluate_relation(comparator, first_term, second_term, var_type)
             if comp:
-                return (relation[0] + f' valor={relation_value}', relation_value, (comparator, first_term, second_term))
+                return RelationAnnotation(comparator, first_term, second_term, relation_value)
             else:
-                return (relation[0] + f'valor={relation_value}', relation_value, (comparator, first_term, second_term, self.process_program(condition[2])))
-        elif relation[0] == 'comparador':
-            comparator = relation[1]
-            first_exp = relation[2]
-            second_exp = relation[3]
-            logical_relation_1 = self.process_logical_relation(first_exp, True)
-            logical_relation_2 = self.process_logical_relation(second_exp, True)
+                return RelationAnnotation(comparator, first_term, second_term, relation_value, (yield self.process_block(condition.body)))
+        elif isinstance(relation, Logical):
+            comparator = relation.op
+            first_exp = relation.left
+            second_exp = relation.right
+            logical_relation_1 = yield self.process_logical_relation(first_exp, True)
+            logical_relation_2 = yield self.process_logical_relation(second_exp, True)
             if comparator == 'or':
-                return (relation[0], comparator, f'\n valor={logical_relation_1[1] or logical_relation_2[1]}', logical_relation_1, logical_relation_2)
+                return LogicalAnnotation(comparator, logical_relation_1[1] or logical_relation_2[1], logical_relation_1, logical_relation_2)
             elif comparator == 'and':
-                return (relation[0], comparator, f'\n valor={logical_relation_1[1] and logical_relation_2[1]}', logical_relation_1, logical_relation_2)
+                return LogicalAnnotation(comparator, logical_relation_1[1] and logical_relation_2[1], logical_relation_1, logical_relation_2)
     
     
     def process_input_output(self, declaration):
-        isNotInTable = symbol_table.get(declaration[1]) is None
-        if not isNotInTable:
-            return (declaration[0], declaration[1], f'valor={symbol_table.get(declaration[1])["value"]}')
-        elif isinstance(declaration[1], tuple):
-            expr_value = self.evaluate_expression(declaration[1], 'int', False)
-            return (declaration[0], f'valor={expr_value[1]}', expr_value)
+        value = declaration.value if declaration.kind == COUT else declaration.name
+        symbol = self.symbols.lookup(value)
+        if symbol is not None:
+            return (declaration.label, value, Annotation('valor', symbol.value))
+        elif isinstance(value, Node):
+            expr_value = self.annotate_expression(value, 'int')
+            if expr_value is None:
+                return (declaration.label, 'valor=Error')
+            return (declaration.label, Annotation('valor', expr_value.value), expr_value)
         else:
-            self.errors.append(f"Error: La variable '{declaration[1][0]}' aún no ha sido declarada")
+            self.errors.append(f"Error: La variable '{value[0]}' aún no ha sido declarada")
             return None
 
     def evaluate_relation(self, comparator, first_term, second_term, var_type):
-        if comparator == '>':
-            return self.evaluate_expression(first_term, var_type, False) > self.evaluate_expression(second_term, var_type, False)
-        elif comparator == '<':
-            return self.evaluate_expression(first_term, var_type, False) < self.evaluate_expression(second_term, var_type, False)
-        elif comparator == '>=':
-            return self.evaluate_expression(first_term, var_type, False) >= self.evaluate_expression(second_term, var_type, False)
-        elif comparator == '<=':
-            return self.evaluate_expression(first_term, var_type, False) <= self.evaluate_expression(second_term, var_type, False)
-        elif comparator == '==':
-            return self.evaluate_expression(first_term, var_type, False) == self.evaluate_expression(second_term, var_type, False)
-        elif comparator == '!=':
-            return self.evaluate_expression(first_term, var_type, False) != self.evaluate_expression(second_term, var_type, False)
-
-    def evaluate_expression(self, expr, var_type, is_assign):
-        if expr is None:
-            self.errors.append("Error: expresión no válida (valor es None).")
+        first_value = self.evaluate_expression(first_term, var_type)
+        second_value = self.evaluate_expression(second_term, var_type)
+        if first_value is None or second_value is None:
             return None
-        isNotInTable = symbol_table.get(expr) is None
-        if isinstance(expr, tuple):
-            value_1 = self.evaluate_expression(expr[1], var_type, False)
-            value_2 = self.evaluate_expression(expr[2], var_type, False)
-            if value_1 == None:
+        return RELATIONS[comparator](first_value, second_value)
+
+    def evaluate_expression(self, expr, var_type, is_assign=False):
+        if is_assign and self.symbols.lookup(expr) is None:
+            # Asignación directa de una constante: tiene que ser del tipo de la variable
+            if expr is None:
+                self.errors.append("Error: expresión no válida (valor es None).")
                 return None
-            if value_2 == None:
+            try:
+                return float(expr) if var_type == 'double' else int(expr)
+            except ValueError:
                 return None
-            tuple_1 = None
-            tuple_2 = None
-            value_1_tuple = False
-            value_2_tuple = False
-            if isinstance(value_1, tuple):
-                tuple_1 = value_1
-                if len(value_1) == 2:
-                    value_1 = value_1[0]
-                else:
-                    value_1 = value_1[1]
-                value_1_tuple = True
-            if isinstance(value_2, tuple):
-                tuple_2 = value_2
-                if len(value_2) == 2:
-                    value_2 = value_2[0]
-                else:
-                    value_2 = value_2[1]
-                value_2_tuple = True
-            if expr[0] == '+':
-                result = value_1 + value_2
-                res_type = var_type
-                if var_type == 'int':
-                    result = math.trunc(result)
-                    res_type="int"
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if expr[0] == '=' and var_type == 'double':
-                    result = float(result)
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
-                else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-            elif expr[0] == '-':
-                result = value_1 - value_2
-                res_type = var_type
-                if var_type == 'int':
-                    result = math.trunc(result)
-                    res_type="int"
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
-                else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-            elif expr[0] == '*':
-                result = value_1 * value_2
-                res_type = var_type
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if var_type == 'int':
-                    result = math.trunc(result)
-                    res_type="int"
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
-                else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-            elif expr[0] == '/':
-                result = value_1 / value_2
-                res_type = var_type
-                if var_type == 'int' or isinstance(value_1, int):
-                    result = math.trunc(result)
-                    result = int(result)
-                    res_type="int"
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
-                else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-            elif expr[0] == '%':
-                result = value_1 % value_2
-                res_type = var_type
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if var_type == 'int':
-                    result = math.trunc(result)
-                    res_type="int"
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
-                else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-            elif expr[0] == '^':
-                result = value_1 ** value_2
-                res_type = var_type
-                if isinstance(value_1, float) or isinstance(value_2, float):
-                    result = float(result)
-                    res_type="double"
-                if var_type == 'int':
-                    result = math.trunc(result)
-                    res_type="int"
-                if value_1_tuple and value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), (tuple_2), f'tipo={res_type}')
-                elif value_1_tuple:
-                    return (expr[0] + f' valor={result}', result, (tuple_1), value_2, f'tipo={res_type}')
-                elif value_2_tuple:
-                    return (expr[0] + f' valor={result}', result, value_1, (tuple_2), f'tipo={res_type}')
+        return self.compile_expression(expr, var_type)(self)
+
+    def compile_expression(self, expr, var_type):
+        # Cada expresión se convierte una sola vez, según el tipo de la
+        # variable que recibe el resultado, en una función que recibe el
+        # analizador y devuelve el valor, o None si no se puede evaluar. Las
+        # funciones de un análisis anterior se reusan para los nodos que el
+        # parser incremental conservó.
+        if not isinstance(expr, Node):
+            return compile_term(expr)
+        key = (id(expr), var_type)
+        entry = self.compiled.get(key)
+        if entry is None:
+            entry = self.previous.get(key)
+            if entry is None or entry[0] is not expr:
+                entry = (expr, self._compile(expr, var_type))
+            self.compiled[key] = entry
+        return entry[1]
+
+    def _compile(self, expr, var_type):
+        # La expresión queda en notación postfija, que se evalúa con una pila
+        # sin importar su profundidad: las constantes y variables son las
+        # funciones de compile_term y los operadores, tuplas (op, operación).
+        # pot, relacion y comparador no tienen valor dentro de una expresión
+        # y su operación es None.
+        code = []
+        target = var_type == 'int'
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is tuple:
+                code.append(node)
+            elif isinstance(node, Node):
+                if node.kind == BIN_OP:
+                    stack.append((node.op, ARITHMETIC[node.op][target]))
                 else:
-                    return (expr[0] + f' valor={result}', result, value_1, value_2, f'tipo={res_type}')
-        elif not isNotInTable:
-            variable = symbol_table.get(expr)
-            if variable is None or variable["value"] is None:
-                self.errors.append(f"Error: la variable '{expr}' no tiene un valor asignado.")
-                return None
-            return self.evaluate_expression(variable["value"], variable["type"], False)
-        else:
-            if is_assign:
-                if var_type == 'double':
-                    try:
-                        return (float(expr), 'type=double')
-                    except:
-                        return None
-                elif var_type == 'int':
-                    try:
-                        return (int(expr), 'type=int')
-                    except:
-                        return None
+                    stack.append((None, None))
+                stack.append(node.right)
+                stack.append(node.left)
             else:
-                str_val = expr
-                float_re = re.compile('-?\d+.\d+')
-                expr = float(expr)
-                is_float = False
-                if isinstance(str_val, str):
-                    is_float = float_re.match(str_val)
-                elif var_type == 'double':
-                    is_float = True
-                if expr % 1 == 0 and not is_float:
-                    math.trunc(expr)
-                    return (int(expr), 'type=int')
+                code.append(compile_term(node))
+
+        def evaluate(analyzer):
+            values = []
+            for instruction in code:
+                if instruction.__class__ is not tuple:
+                    values.append(instruction(analyzer))
+                    continue
+                b = values.pop()
+                a = values.pop()
+                op, apply = instruction
+                if apply is None or a is None or b is None:
+                    values.append(None)
+                    continue
+                try:
+                    values.append(apply(a, b))
+                except ZeroDivisionError:
+                    analyzer.errors.append(f"Error: división entre cero en '{op}'")
+                    values.append(None)
+            return values[0]
+        return evaluate
+
+    def annotate_expression(self, expr, var_type):
+        # Evalúa la operación y devuelve su ExpressionAnnotation, o None si no
+        # se puede evaluar. Solo la usan las sentencias cuya anotación incluye
+        # la expresión; las condiciones usan compile_expression.
+        # Cada nodo se visita dos veces: al bajar apila sus operandos y al
+        # volver combina sus anotaciones. Las constantes y variables quedan
+        # en la pila como su valor.
+        target = var_type == 'int'
+        annotations = []
+        stack = [(expr, False)]
+        while stack:
+            node, ready = stack.pop()
+            if not ready:
+                # Los operandos que no son nodos se evalúan sin pasar por la
+                # pila, en el mismo orden en que se evaluarían recursivamente
+                stack.append((node, True))
+                if isinstance(node.right, Node):
+                    stack.append((node.right, False))
+                if isinstance(node.left, Node):
+                    stack.append((node.left, False))
                 else:
-                    return (expr, 'type=double')
-                
+                    annotations.append(compile_term(node.left)(self))
+                continue
+            second = annotations.pop() if isinstance(node.right, Node) else compile_term(node.right)(self)
+            first = annotations.pop()
+            if node.kind != BIN_OP or first is None or second is None:
+                annotations.append(None)
+                continue
+            a = first.value if first.__class__ is ExpressionAnnotation else first
+            b = second.value if second.__class__ is ExpressionAnnotation else second
+            try:
+                result = ARITHMETIC[node.op][target](a, b)
+            except ZeroDivisionError:
+                self.errors.append(f"Error: división entre cero en '{node.op}'")
+                annotations.append(None)
+                continue
+            annotations.append(ExpressionAnnotation(node.op, result, result_type(node.op, var_type, a, b), first, second))
+        return annotations[0]
+
     def return_symbol_table(self):
-        return symbol_table
+        return self.symbols
 
     def add_to_symbol_table(self, var_name, var_type, value, lineno):
-        loc = len(symbol_table) + 1
-        if var_name in symbol_table:
-            if isinstance(symbol_table[var_name], list):
-                symbol_table[var_name].append({
-                    "name": var_name,
-                    "type": var_type,
-                    "value": value,
-                    "loc": loc,
-                    "lineno": lineno
-                })
-            else:
-                symbol_table[var_name] = [symbol_table[var_name], {
-                    "name": var_name,
-                    "type": var_type,
-                    "value": value,
-                    "loc": loc,
-                    "lineno": lineno
-                }]
-        else:
-            symbol_table[var_name] = {
-                "name": var_name,
-                "type": var_type,
-                "value": value,
-                "loc": loc,
-                "lineno": lineno
-            }
-
-    def clean_temp_sym_table(self):
-        temp_sym_table.clear()
-        symbol_table.clear()
-    
-    def add_to_temp_symbol_table(var_name, lineno):
-        if not var_name in temp_sym_table:
-            temp_sym_table[var_name] = {
-                "name": var_name,
-                "lineno": [lineno]
-            }
-        else:
-            lineno_tab = temp_sym_table.get(var_name)["lineno"]
-            lineno_tab.append(lineno)
-            temp_sym_table[var_name] = {
-                "name": var_name,
-                "lineno": lineno_tab
-            }
-
-    def print_symbol_table(self):
-        html_table = "<table style='border-collapse: collapse;' width='100%'><tr style='color: #1155d4; font-size: 15px'><th style='padding: 8px;'>Variable</th><th style='padding: 8px;'>Tipo</th><th style='padding: 8px;'>Valor</th><th style='padding: 8px;'>Número de Registro</th><th style='padding: 8px;'>Líneas</th></tr>"
-        
-        for var, info in symbol_table.items():
-            html_table += f"<tr><td style='text-align: center; padding: 5px;'>{var}</td>"
-            html_table += f"<td style='text-align: center; padding: 5px;'>{info['type']}</td>"
-            html_table += f"<td style='text-align: center; padding: 5px;'>{info['value'] if info['value'] is not None else 'none'}</td>"
-            html_table += f"<td style='text-align: center; padding: 5px;'>{info['loc']}</td>"
-            html_table += f"<td style='text-align: center; padding: 5px;'>{info['lineno']}</td></tr>"
-        
-        html_table += "</table>"
-        return html_table
+        return self.symbols.declare(var_name, var_type, value, lineno)
 
-    def build_annotated_tree(self, tree):
-        annotated_tree_item = self.add_annotated_items(tree)
-        return annotated_tree_item
+    def load_identifier_index(self, index):
+        self.identifiers = index
 
-    def add_annotated_items(self, element):
-        if element is None:
-            return None
+    # Filas del árbol anotado para modelos.TreeModel: cada tupla es una fila
+    # "etiqueta [anotaciones]" con los demás elementos como hijos, cada
+    # lista una fila "lista" y lo demás una hoja. El texto de una fila con
+    # anotaciones muy largas se corta en ANNOTATION_TEXT_LIMIT.
+    def annotated_element(self, element):
+        if isinstance(element, Node):
+            # Subexpresiones del árbol sintáctico dentro de las anotaciones
+            return (element.label, *element.children())
+        if isinstance(element, Annotated):
+            return element.row()
+        return element
 
+    def annotated_children(self, element):
+        element = self.annotated_element(element)
         if isinstance(element, tuple):
-            node_type = str(element[0])
-            annotations = ', '.join([str(item) for item in element[1:]])
-
-            item = QStandardItem(f"{node_type} [{annotations}]")
-            
-            for child in element[1:]:
-                child_item = self.add_annotated_items(child)
-                if child_item is not None:
-                    item.appendRow(child_item)
-
+            children = element[1:]
         elif isinstance(element, list):
-            item = QStandardItem("lista")
-            for subelement in element:
-                subitem = self.add_annotated_items(subelement)
-                if subitem is not None:
-                    item.appendRow(subitem)
-
-        elif isinstance(element, tuple) and element[0] == 'do-until':
-            item = QStandardItem(f"do-until [{element[1:]}]")
-            body_item = self.add_annotated_items(element[1])
-            condition_item = self.add_annotated_items(element[2]) 
-            if body_item:
-                item.appendRow(body_item)
-            if condition_item:
-                item.appendRow(condition_item)
-
+            children = element
         else:
-            item = QStandardItem(str(element))
+            return []
+        return [child for child in children if child is not None]
 
-        return item
+    def annotated_text(self, element):
+        element = self.annotated_element(element)
+        if isinstance(element, tuple):
+            node_type = self.item_text(element[0])
+            annotations = ', '.join([self.item_text(item) for item in element[1:]])
+            if len(annotations) > ANNOTATION_TEXT_LIMIT:
+                annotations = annotations[:ANNOTATION_TEXT_LIMIT] + "…"
+            return f"{node_type} [{annotations}]"
+        if isinstance(element, list):
+            return "lista"
+        return str(element)
 
+    def item_text(self, item):
+        # Texto de un elemento dentro de la fila de su padre
+        if isinstance(item, (str, Annotation)):
+            return str(item)
+        return to_text(item, ANNOTATION_TEXT_LIMIT, annotation_row)
 
     def print_errors(self):
         if self.errors:
@@ -434,4 +641,10 @@ class SemanticAnalyzer:
             return self.errors
         else:
             print("No se encontraron errores semanticos.")
-            return None
\ No newline at end of file
+            return None
+
+    # Tabla de despacho de process_program
+    visit_VarDecl = process_variable_declaration
+    visit_Assign = process_assignment
+    visit_If = visit_IfElse = visit_While = visit_DoUntil = process_logical_structure
+    visit_Cin = visit_Cout = process_input_output
\ No newline at end of file
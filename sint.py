@@ -1,18 +1,44 @@
+import re
+import sys
+import tablas
 import ply.yacc as yacc
-from lexer import tokens
-from sem import SemanticAnalyzer
-
-errores_sintacticos = []
+from lexer import tokens as lexer_tokens, tokenize, KIND_CODES
+from arbol import (Program, VarDecl, Assign, Increment, Decrement, If, IfElse, While, DoUntil,
+                   Cin, Cout, BinOp, Pow, Relation, Logical, Error, shift)
+
+# yacc lee de este módulo la lista de tokens de la gramática
+tokens = lexer_tokens
+
+def _span(p):
+    # Rango del texto que cubre la regla; las posiciones de los no terminales
+    # vienen del seguimiento de PLY (tracking) y de endlexpos en los tokens
+    return p.lexpos(1), p.lexspan(len(p) - 1)[1]
+
+def _expression(p, cls, *fields):
+    # Con una tabla de expresiones en el parser, las expresiones iguales son
+    # el mismo nodo (se guardan las posiciones de la primera aparición). Los
+    # hijos ya están compartidos, así que basta compararlos por identidad.
+    table = getattr(p.parser, 'expressions', None)
+    if table is None:
+        return cls(*fields, *_span(p))
+    key = (cls.kind,) + tuple(field if field.__class__ is str else id(field) for field in fields)
+    node = table.get(key)
+    if node is None:
+        node = table[key] = cls(*fields, *_span(p))
+    return node
 
 def p_programa(p):
     'programa : MAIN LBRACE lista_declaraciones RBRACE'
-    p[0] = ('programa', p[3])
+    p[0] = p.parser.program = Program(p[3], *_span(p))
 
 def p_lista_declaraciones(p):
     '''lista_declaraciones : lista_declaraciones declaracion
                         | declaracion'''
+    # La lista de la izquierda es nueva en cada análisis: se extiende en su
+    # lugar en vez de copiarla en cada reducción
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -22,19 +48,27 @@ def p_declaracion(p):
                    | comentario'''
     p[0] = p[1]
 
+def p_declaracion_error(p):
+    'declaracion : lista_sentencias error'
+    # Error al final de una lista del primer nivel, antes de la } o de una
+    # declaración: se conservan las sentencias anteriores
+    p[1].append(Error(*p.lexspan(2)))
+    p[0] = p[1]
+
 def p_comentario(p):
     'comentario : COMENTARIO'
     p[0] = None
 
 def p_declaracion_variable(p):
     'declaracion_variable : tipo identificador SEMICOLON'
-    p[0] = (p[1], p[2])
+    p[0] = VarDecl(p[1], p[2], *_span(p))
 
 def p_identificador(p):
     '''identificador : identificador COMMA IDENTIFICADOR
                   | IDENTIFICADOR'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -47,7 +81,8 @@ def p_lista_sentencias(p):
     '''lista_sentencias : lista_sentencias sentencia 
                       | vacio'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -63,17 +98,37 @@ def p_sentencia(p):
                 | declaracion_variable'''
     p[0] = p[1]
 
+def p_sentencia_error(p):
+    'sentencia : error SEMICOLON'
+    # Se descartan los tokens hasta el ; y la sentencia queda como error
+    p[0] = Error(*_span(p))
+
+def p_cuerpo(p):
+    '''cuerpo_then : lista_sentencias
+                   | lista_sentencias error
+       cuerpo : lista_sentencias
+              | lista_sentencias error
+       cuerpo_do : lista_sentencias
+                 | lista_sentencias error'''
+    # Cuerpo de un if, un else o while y un do: un error antes de la palabra
+    # que cierra el bloque no se la come. Cada bloque tiene su regla para que
+    # el error solo se cierre con esa palabra (then: end o else; else y
+    # while: end; do: until) y la recuperación siempre avance.
+    if len(p) == 3:
+        p[1].append(Error(*p.lexspan(2)))
+    p[0] = p[1]
+
 def p_asignacion(p):
     'asignacion : IDENTIFICADOR ASSIGN expresion_finalizada'
-    p[0] = (p[2], p[1], p[3])
+    p[0] = Assign(p[1], p[3], *_span(p))
 
 def p_incremento(p):
     'incremento : IDENTIFICADOR INC SEMICOLON'
-    p[0] = ('incremento', p[1], '+', [p[1], '1'])
+    p[0] = Increment(p[1], *_span(p))
 
 def p_decremento(p):
     'decremento : IDENTIFICADOR DEC SEMICOLON'
-    p[0] = ('decremento', p[1], '-', [p[1], 1])
+    p[0] = Decrement(p[1], *_span(p))
 
 def p_expresion_finalizada(p):
     '''expresion_finalizada : expresion SEMICOLON
@@ -84,38 +139,36 @@ def p_expresion_finalizada(p):
         p[0] = None
 
 def p_seleccion(p):
-    '''seleccion : IF expresion THEN lista_sentencias END
-                 | IF expresion THEN lista_sentencias ELSE lista_sentencias END'''
+    '''seleccion : IF expresion THEN cuerpo_then END
+                 | IF expresion THEN cuerpo_then ELSE cuerpo END'''
     if len(p) == 6:
-        p[0] = ('if', p[2], p[4])
+        p[0] = If(p[2], p[4], *_span(p))
     else:
-        p[0] = ('if-else', p[2], p[4], p[6])
+        p[0] = IfElse(p[2], p[4], p[6], *_span(p))
 
 def p_iteracion(p):
-    'iteracion : WHILE expresion DO lista_sentencias END'
-    p[0] = ('while', p[2], p[4])
+    'iteracion : WHILE expresion DO cuerpo END'
+    p[0] = While(p[2], p[4], *_span(p))
 
 def p_repeticion(p):
-    'repeticion : DO lista_sentencias UNTIL expresion SEMICOLON'
-    p[0] = ('do-until', p[2], p[4])
+    'repeticion : DO cuerpo_do UNTIL expresion SEMICOLON'
+    p[0] = DoUntil(p[2], p[4], *_span(p))
 
 def p_entrada(p):
     'entrada : CIN IDENTIFICADOR SEMICOLON'
-    p[0] = ('cin', p[2])
+    p[0] = Cin(p[2], *_span(p))
 
 def p_salida(p):
     '''salida : COUT expresion SEMICOLON
               | COUT STRING SEMICOLON'''
-    if len(p) == 4 and isinstance(p[2], str) and p[2].startswith('"') and p[2].endswith('"'):
-        p[0] = ('cout', p[2])  # Literal de texto
-    else:
-        p[0] = ('cout', p[2])  # Variable o expresión
+    # Literal de texto, variable o expresión
+    p[0] = Cout(p[2], *_span(p))
 
 def p_expresion(p):
     '''expresion : expresion operador_comparacion expresion_comparacion
                  | expresion_comparacion'''
     if len(p) == 4:
-        p[0] = ('comparador', p[2], p[1], p[3])
+        p[0] = _expression(p, Logical, p[2], p[1], p[3])
     else:
         p[0] = p[1]
 
@@ -128,7 +181,7 @@ def p_expresion_comparacion(p):
     '''expresion_comparacion : expresion_simple operacion_relacional expresion_simple
                        | expresion_simple'''
     if len(p) == 4:
-        p[0] = ('relacion', p[2], [p[1], p[3]])
+        p[0] = _expression(p, Relation, p[2], p[1], p[3])
     else:
         p[0] = p[1]
 
@@ -145,7 +198,7 @@ def p_expresion_simple(p):
     '''expresion_simple : expresion_simple primer_operador term
                          | term'''
     if len(p) == 4:
-        p[0] = (p[2], p[1], p[3])
+        p[0] = _expression(p, BinOp, p[2], p[1], p[3])
     else:
         p[0] = p[1]
 
@@ -158,7 +211,7 @@ def p_term(p):
     '''term : term segundo_operador factor
             | factor'''
     if len(p) == 4:
-        p[0] = (p[2], p[1], p[3])
+        p[0] = _expression(p, BinOp, p[2], p[1], p[3])
     else:
         p[0] = p[1]
 
@@ -172,7 +225,7 @@ def p_factor(p):
     '''factor : factor tercer_operador componente
               | componente'''
     if len(p) == 4:
-        p[0] = ('pot', p[1], p[3])
+        p[0] = _expression(p, Pow, p[1], p[3])
     else:
         p[0] = p[1]
 
@@ -195,20 +248,244 @@ def p_vacio(p):
     p[0] = []
 
 def p_error(p):
-    if p:
-        error_message = f"Error de sintaxis en '{p.value}', línea {p.lineno}"
-        errores_sintacticos.append(error_message)
-        parser.errok()
-    else:
-        error_message = "Error de sintaxis en EOF"
-        errores_sintacticos.append(error_message)
-    
-    if hasattr(parser, 'error_output') and parser.error_output is not None:
-        parser.error_output.append(error_message)
-    else:
-        print(error_message)
-
-def set_error_output(output_widget):
-    parser.error_output = output_widget
-
-parser = yacc.yacc()
\ No newline at end of file
+    # yacc pide un p_error para construir las tablas; los errores de cada
+    # análisis los reporta ParseSession.p_error
+    pass
+
+parser = tablas.build_parser(sys.modules[__name__])
+
+# Tablas LALR del parser global. No cambian después de construirse, así que
+# todas las sesiones las comparten.
+tables = yacc.LRTable()
+tables.lr_productions = parser.productions
+tables.lr_action = parser.action
+tables.lr_goto = parser.goto
+
+# Errores de sintaxis que se reportan por análisis
+MAX_SYNTAX_ERRORS = 100
+
+class ParseSession:
+    # Un análisis sintáctico con su propia pila de PLY y su propia lista de
+    # errores; varias sesiones pueden analizar a la vez en distintos hilos.
+    # Con share=True las expresiones repetidas de un mismo análisis comparten
+    # nodo y el árbol queda como un grafo (DAG).
+    def __init__(self, error_output=None, share=False, max_errors=MAX_SYNTAX_ERRORS):
+        self.errors = []
+        self.reported = set()
+        self.max_errors = max_errors
+        self.error_output = error_output
+        self.share = share
+        # Buffer que se está analizando; su índice de líneas da la línea y
+        # columna de los errores
+        self.buffer = None
+        self.parser = yacc.LRParser(tables, self.p_error)
+        self.parser.expressions = None
+        self.parser.program = None
+
+    def parse(self, buffer, indices=None):
+        if isinstance(buffer, str):
+            buffer = tokenize(buffer)
+        self.errors = []
+        self.reported = set()
+        self.parser.expressions = {} if self.share else None
+        self.parser.program = None
+        self.buffer = buffer
+        tree = self.parser.parse(lexer=buffer.reader(indices), tracking=True)
+        if tree is None and self.errors:
+            tree = self._partial_tree(len(buffer.source))
+        return tree
+
+    def _partial_tree(self, end):
+        # PLY deja de analizar si llega al final del texto sin recuperarse (un
+        # bloque sin cerrar, falta la }). El programa se arma con lo que quedó
+        # completo en la pila y lo demás, hasta el final, queda como error.
+        # Si una } de más cerró el programa antes de tiempo, el texto que
+        # sigue a esa } es el error.
+        program = self.parser.program
+        if program is not None:
+            program.body.append(Error(program.end, end))
+            program.end = end
+            return program
+        stack = self.parser.symstack
+        if len(stack) < 3 or stack[1].type != 'MAIN' or stack[2].type != 'LBRACE':
+            return None
+        rest = stack[3:]
+        body = []
+        if rest and rest[0].type == 'lista_declaraciones':
+            body = rest.pop(0).value
+        current = []
+        if rest and rest[0].type == 'lista_sentencias':
+            current = rest.pop(0).value
+        current.append(Error(getattr(rest[0], 'lexpos', end) if rest else end, end))
+        body.append(current)
+        return Program(body, stack[1].lexpos, end)
+
+    def p_error(self, p):
+        # El parser se recupera con las reglas de error de la gramática; los
+        # mensajes repetidos se reportan una vez y después de max_errors solo
+        # se avisa que hay más
+        if len(self.errors) > self.max_errors:
+            return
+        if p:
+            line, column = self.buffer.line_index().position(p.lexpos)
+            error_message = f"Error de sintaxis en '{p.value}', línea {line}, columna {column}"
+        else:
+            error_message = "Error de sintaxis en EOF"
+        if error_message in self.reported:
+            return
+        self.reported.add(error_message)
+        if len(self.errors) == self.max_errors:
+            error_message = f"Hay más de {self.max_errors} errores de sintaxis; no se muestran los demás"
+        self.errors.append(error_message)
+        if self.error_output is not None:
+            self.error_output.append(error_message)
+
+def parse(buffer, share=False):
+    return ParseSession(share=share).parse(buffer)
+
+_MAIN, _LBRACE, _RBRACE = KIND_CODES['MAIN'], KIND_CODES['LBRACE'], KIND_CODES['RBRACE']
+_IF, _WHILE, _DO = KIND_CODES['IF'], KIND_CODES['WHILE'], KIND_CODES['DO']
+_END, _UNTIL = KIND_CODES['END'], KIND_CODES['UNTIL']
+_SEMICOLON, _COMENTARIO = KIND_CODES['SEMICOLON'], KIND_CODES['COMENTARIO']
+_STRUCTURE = re.compile(b'[' + b''.join(re.escape(bytes([code])) for code in (_IF, _WHILE, _DO, _END, _UNTIL, _SEMICOLON, _COMENTARIO)) + b']')
+
+def split_statements(buffer):
+    # Rangos de tokens [inicio, fin) de cada sentencia de primer nivel dentro
+    # de main { ... }. Solo se recorren los tokens que abren o cierran
+    # bloques y los ;. Devuelve None si el programa no tiene esa forma.
+    kinds = buffer.kinds
+    n = len(kinds)
+    if n < 3 or kinds[0] != _MAIN or kinds[1] != _LBRACE or kinds[n - 1] != _RBRACE:
+        return None
+    data = kinds.tobytes()
+    units = []
+    start = 2
+    depth = 0
+    loop_do = 0
+    for match in _STRUCTURE.finditer(data, 2, n - 1):
+        i = match.start()
+        kind = data[i]
+        if kind == _COMENTARIO:
+            if depth or start != i:
+                return None
+            units.append((i, i + 1))
+            start = i + 1
+        elif kind == _IF:
+            depth += 1
+        elif kind == _WHILE:
+            depth += 1
+            loop_do += 1
+        elif kind == _DO:
+            # El do de un while no abre otro bloque; el de do-until sí
+            if loop_do:
+                loop_do -= 1
+            else:
+                depth += 1
+        elif kind == _END or kind == _UNTIL:
+            depth -= 1
+            if depth < 0:
+                return None
+            if kind == _END and depth == 0:
+                units.append((start, i + 1))
+                start = i + 1
+        elif depth == 0:
+            units.append((start, i + 1))
+            start = i + 1
+    if depth or start != n - 1:
+        return None
+    return units
+
+class IncrementalParser:
+    # Cada sentencia de primer nivel se analiza por separado, entre los tokens
+    # main { y } del programa, y su subárbol se guarda con el texto de la
+    # sentencia como llave. Después de una edición solo se analizan las
+    # sentencias cuyo texto cambió; a las demás se les mueven las posiciones
+    # si el texto anterior cambió de largo. Si alguna tiene errores se analiza
+    # todo el programa para reportarlos igual que el parser normal.
+    def __init__(self, share=False):
+        self.cache = {}
+        self.length = 0
+        self.share = share
+        self.tree = None
+        self.errors = []
+        self.reparsed = 0
+
+    def parse(self, buffer):
+        if isinstance(buffer, str):
+            buffer = tokenize(buffer)
+        # Con share=True cada sentencia comparte sus propias expresiones
+        session = ParseSession(share=self.share)
+        units = split_statements(buffer)
+        items = None if units is None else self._parse_units(session, buffer, units)
+        self.length = len(buffer.source)
+        if items is None:
+            self.cache = {}
+            self.reparsed = len(units) if units else 1
+            self.tree = session.parse(buffer)
+        else:
+            last = len(buffer) - 1
+            self.tree = Program(_group(items), buffer.offsets[0], buffer.offsets[last] + buffer.lengths[last])
+        self.errors = session.errors
+        return self.tree
+
+    def _parse_units(self, session, buffer, units):
+        source = buffer.source
+        offsets, lengths = buffer.offsets, buffer.lengths
+        frame = [0, 1]
+        close = [len(buffer) - 1]
+        # Una sentencia que no se movió está en la misma posición que antes (si
+        # está antes de la edición) o corrida lo que creció el texto (si está
+        # después)
+        growth = len(source) - self.length
+        cache = {}
+        items = []
+        reparsed = 0
+        for start, end in units:
+            begin = offsets[start]
+            key = source[begin:offsets[end - 1] + lengths[end - 1]]
+            # Sentencias con el mismo texto tienen cada una su subárbol,
+            # guardado con la posición donde empezaba
+            entries = self.cache.get(key)
+            if entries:
+                if begin in entries:
+                    kind, node = entries.pop(begin)
+                elif begin - growth in entries:
+                    kind, node = entries.pop(begin - growth)
+                    shift(node, growth)
+                else:
+                    old_begin, (kind, node) = entries.popitem()
+                    shift(node, begin - old_begin)
+            else:
+                tree = session.parse(buffer, frame + list(range(start, end)) + close)
+                if session.errors or not tree or len(tree.body) != 1:
+                    return None
+                node = tree.body[0]
+                kind = 'sentencias' if isinstance(node, list) else 'primer_nivel'
+                reparsed += 1
+            cache.setdefault(key, {})[begin] = (kind, node)
+            items.append((kind, node))
+        self.cache = cache
+        self.reparsed = reparsed
+        return items
+
+def _group(items):
+    # Agrupa las sentencias como lo hace la gramática: una declaración fuera
+    # de una lista de sentencias queda en el primer nivel, un comentario
+    # termina la lista y cualquier otra sentencia abre una si no la hay
+    body = []
+    current = None
+    for kind, node in items:
+        if kind == 'primer_nivel':
+            if node is None:
+                current = None
+                body.append(None)
+            elif current is None:
+                body.append(node)
+            else:
+                current.append(node)
+        else:
+            if current is None:
+                current = []
+                body.append(current)
+            current.extend(node)
+    return body or [[]]
\ No newline at end of file
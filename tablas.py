@@ -0,0 +1,80 @@
+import importlib
+import os
+import sys
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+# Tablas del lexer y del parser generadas de antemano. Se usan solo si su
+# firma coincide con las reglas actuales; si no, PLY las vuelve a construir en
+# memoria sin escribir nada junto al código. Con COMPILADOR_OPTIMIZE=0 siempre
+# se construyen.
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+LEXTAB = 'lextab'
+PARSETAB = 'parsetab'
+OPTIMIZE = os.environ.get('COMPILADOR_OPTIMIZE', '1') != '0'
+
+# Tiempo máximo de arranque (importar lexer y sint) con las tablas guardadas
+STARTUP_TARGET = 0.05
+
+def lexer_signature(module):
+    # Tokens, estados y reglas en el orden en que PLY las prueba
+    parts = [repr(module.tokens), repr(getattr(module, 'states', ())), repr(getattr(module, 't_ignore', ''))]
+    rules = []
+    for name, rule in vars(module).items():
+        if not name.startswith('t_') or name == 't_ignore':
+            continue
+        if callable(rule):
+            rules.append((0, rule.__code__.co_firstlineno, name, rule.__doc__ or ''))
+        else:
+            rules.append((1, 0, name, rule))
+    for _, _, name, pattern in sorted(rules):
+        parts.append(name + ' ' + pattern)
+    return '\n'.join(parts)
+
+def _load_table(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def build_lexer(module):
+    if OPTIMIZE:
+        table = _load_table(LEXTAB)
+        if table is not None and getattr(table, '_lexsignature', None) == lexer_signature(module):
+            return lex.lex(module=module, optimize=1, lextab=table)
+    return lex.lex(module=module)
+
+def build_parser(module):
+    # yacc compara la firma de la gramática con la de parsetab antes de usarla;
+    # un módulo de tablas inexistente obliga a construirlas
+    tabmodule = PARSETAB if OPTIMIZE else '_sin_tablas'
+    return yacc.yacc(module=module, tabmodule=tabmodule, outputdir=TABLES_DIR, write_tables=False, debug=False)
+
+def generate():
+    import lexer
+    import sint
+    lexobj = lex.lex(module=lexer)
+    lexobj.writetab(LEXTAB, TABLES_DIR)
+    with open(os.path.join(TABLES_DIR, LEXTAB + '.py'), 'a') as f:
+        f.write('_lexsignature = %r\n' % lexer_signature(lexer))
+    yacc.yacc(module=sint, tabmodule=PARSETAB, outputdir=TABLES_DIR, write_tables=True, debug=False)
+
+def startup_time(optimize=True, runs=5):
+    import subprocess
+    env = dict(os.environ, COMPILADOR_OPTIMIZE='1' if optimize else '0')
+    code = 'import time; s = time.perf_counter(); import lexer, sint; print(time.perf_counter() - s)'
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=TABLES_DIR, env=env, capture_output=True, text=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+if __name__ == '__main__':
+    generate()
+    cold = startup_time(optimize=False)
+    warm = startup_time(optimize=True)
+    print(f"Arranque construyendo tablas: {cold * 1000:.1f} ms")
+    print(f"Arranque con tablas guardadas: {warm * 1000:.1f} ms (objetivo {STARTUP_TARGET * 1000:.0f} ms)")
+    if warm > STARTUP_TARGET:
+        sys.exit(1)